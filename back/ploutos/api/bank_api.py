@@ -1,3 +1,4 @@
+import time
 from typing import Optional
 from uuid import uuid4
 from ploutos.utils.secrets import get_secret
@@ -15,10 +16,23 @@ client = NordigenClient(
     secret_id=settings.GO_CARDLESS_SECRET_ID.get_secret_value(),
     secret_key=settings.GO_CARDLESS_SECRET_KEY.get_secret_value(),
 )
-client.generate_token()
+# Refresh the access token this many seconds before it expires
+TOKEN_REFRESH_MARGIN = 30
+_token_expires_at = 0.0
+
+
+def ensure_token() -> None:
+    """Generate a new access token only when the current one is about to expire."""
+    global _token_expires_at
+    now = time.monotonic()
+    if now < _token_expires_at - TOKEN_REFRESH_MARGIN:
+        return
+    token = client.generate_token()
+    _token_expires_at = now + token["access_expires"]
 
 
 def connect_to_bank(bank_id: str, requisition_id: Optional[str]) -> Requisition:
+    ensure_token()
     if requisition_id is None:
         requisition_id = client.initialize_session(
             # institution id
@@ -33,6 +47,44 @@ def connect_to_bank(bank_id: str, requisition_id: Optional[str]) -> Requisition:
     return accounts
 
 
+# A connected account re-checks its metadata after this many seconds
+METADATA_TTL = 600
+# accountId -> (secret, api, account_name, metadata, checked_at)
+_connections: dict[str, tuple[str, AccountApi, str, dict, float]] = {}
+
+
+def _connect_account(accountId: str) -> tuple[AccountApi, str, dict]:
+    """Return the API, name and metadata of a READY account.
+
+    The metadata check is reused for METADATA_TTL seconds while the account's
+    secret is unchanged: get_secret is itself cached, and save_secret drops
+    that cache, so updated credentials get a fresh connection.
+    """
+    # Cached AccountApi objects send the client's current token
+    ensure_token()
+    secret, account_name = get_secret(accountId)
+    now = time.monotonic()
+    cached = _connections.get(accountId)
+    if cached is not None and cached[0] == secret and now - cached[4] < METADATA_TTL:
+        return cached[1], cached[2], cached[3]
+
+    api = client.account_api(id=secret)
+    try:
+        metadata = api.get_metadata()
+        if metadata is None or metadata.get("status") != "READY":
+            print(f"Account {account_name} is not enabled")
+            print(connect_to_bank(account_name, requisition_id=None))
+            raise ValueError(f"Account {account_name} is not enabled")
+
+        print(f"Successfully connected to {account_name}")
+    except Exception as e:
+        logger.error(f"Error getting metadata for {account_name} with id {secret}: {e}")
+        raise e
+
+    _connections[accountId] = (secret, api, account_name, metadata, now)
+    return api, account_name, metadata
+
+
 class BankApi:
     api: AccountApi
     account_name: str
@@ -44,27 +96,16 @@ class BankApi:
     """
 
     def __init__(self, accountId: str):
-        secret, self.account_name = get_secret(accountId)
-        client.generate_token()
-        self.api = client.account_api(id=secret)
-        try:
-            self.metadata = self.api.get_metadata()
-            if self.metadata is None or self.metadata.get("status") != "READY":
-                print(f"Account {self.account_name} is not enabled")
-                print(connect_to_bank(self.account_name, requisition_id=None))
-                raise ValueError(f"Account {self.account_name} is not enabled")
-
-            print(f"Successfully connected to {self.account_name}")
-        except Exception as e:
-            logger.error(
-                f"Error getting metadata for {self.account_name} with id {secret}: {e}"
-            )
-            raise e
+        self.api, self.account_name, self.metadata = _connect_account(accountId)
+        # Bind the delegated AccountApi methods used by callers up front so
+        # they resolve as instance attributes instead of via __getattr__
+        self.get_details = self.api.get_details
+        self.get_metadata = self.api.get_metadata
 
     def __getattr__(self, name):
         """
-        Delegate any unknown attribute/method calls directly to the underlying api object.
-        This allows direct access to the Nordigen API methods through this class.
+        Delegate any other attribute/method calls directly to the underlying api object.
+        This allows direct access to the remaining Nordigen API methods through this class.
         """
         return getattr(self.api, name)
 
@@ -102,25 +143,17 @@ class BankApi:
 
 def transactions_to_df(transactions):
     """Processthe result of get_transactions"""
-    df_transactions_booked: Optional[pd.DataFrame] = None
-    df_transactions_pending: Optional[pd.DataFrame] = None
-
-    if len(transactions["booked"]) > 0:
-        df_transactions_booked = process(transactions["booked"])
-        df_transactions_booked["Type"] = "Booked"
-    if len(transactions["pending"]) > 0:
-        df_transactions_pending = process(transactions["pending"])
-        df_transactions_pending["Type"] = "Pending"
-
-    if df_transactions_booked is not None and df_transactions_pending is not None:
-        df_transactions = pd.concat([df_transactions_booked, df_transactions_pending])
-    elif df_transactions_booked is not None:
-        df_transactions = df_transactions_booked
-    elif df_transactions_pending is not None:
-        df_transactions = df_transactions_pending
-    else:
-        df_transactions = pd.DataFrame()
-    return df_transactions
+    frames = []
+    for kind in ("booked", "pending"):
+        if transactions[kind]:
+            df_kind = process(transactions[kind])
+            df_kind["Type"] = kind.capitalize()
+            frames.append(df_kind)
+
+    if not frames:
+        return pd.DataFrame()
+    # A single frame is returned as is, without a concat copy
+    return frames[0] if len(frames) == 1 else pd.concat(frames)
 
 
 def process(transactions: dict):
@@ -135,27 +168,37 @@ def process(transactions: dict):
         },
         inplace=True,
     )
-    df_transactions["Montant"] = df_transactions["Montant_dict"].apply(check_currency)
-    df_transactions["Date"] = pd.to_datetime(df_transactions["Date"], format="%Y-%m-%d")
+    amounts = pd.json_normalize(df_transactions["Montant_dict"].tolist())
+    check_currency(amounts["currency"])
+    df_transactions["Montant"] = amounts["amount"].astype(float).to_numpy()
+    raw_dates = df_transactions["Date"]
+    df_transactions["Date"] = pd.to_datetime(raw_dates, format="%Y-%m-%d")
     if "Date valeur" in df_transactions.columns:
-        df_transactions["Date valeur"] = pd.to_datetime(
-            df_transactions["Date valeur"], format="%Y-%m-%d"
-        )
-        if not df_transactions["Date"].equals(df_transactions["Date valeur"]):
-            print("Date and Date valeur are not the same")
-    if int(df_transactions["Description"].apply(len).max()) > 1:
+        # Value dates usually match booking dates: compare the raw strings
+        # and reuse the parsed column instead of parsing a second time.
+        if raw_dates.equals(df_transactions["Date valeur"]):
+            df_transactions["Date valeur"] = df_transactions["Date"]
+        else:
+            df_transactions["Date valeur"] = pd.to_datetime(
+                df_transactions["Date valeur"], format="%Y-%m-%d"
+            )
+            if not df_transactions["Date"].equals(df_transactions["Date valeur"]):
+                print("Date and Date valeur are not the same")
+    description_lengths = df_transactions["Description"].str.len()
+    if int(description_lengths.max()) > 1:
         print("Error with length of description (Max length is greater than 1)")
-    if int(df_transactions["Description"].apply(len).min()) == 0:
+    if int(description_lengths.min()) == 0:
         print("Error with length of description (Min length is 0)")
-    df_transactions["Description"] = df_transactions["Description"].apply(
-        lambda x: ", ".join(x)
+    # Transactions without remittanceInformationUnstructuredArray get an
+    # empty description rather than NaN
+    df_transactions["Description"] = (
+        df_transactions["Description"].str.join(", ").fillna("")
     )
     return df_transactions
 
 
-def check_currency(Montant_dict: dict):
-    if Montant_dict["currency"] != "EUR":
-        print(f"Currency {Montant_dict['currency']} is not EUR")
-        raise ValueError(f"Currency {Montant_dict['currency']} is not EUR")
-    else:
-        return float(Montant_dict["amount"])
+def check_currency(currencies: pd.Series):
+    not_eur = currencies[currencies != "EUR"]
+    if not not_eur.empty:
+        print(f"Currency {not_eur.iloc[0]} is not EUR")
+        raise ValueError(f"Currency {not_eur.iloc[0]} is not EUR")
@@ -3,11 +3,15 @@ from fastapi import Depends
 from supabase import Client
 
 
-def get_db_dependency():
+async def get_db_dependency():
     """Fonction de dépendance pour récupérer le client DB.
 
     Cette fonction importe get_db à chaque appel, ce qui permet
-    de mocker get_db dans les tests.
+    de mocker get_db dans les tests. Elle est async car elle ne fait
+    que renvoyer le client partagé, sans jamais bloquer : FastAPI l'appelle
+    alors directement sur la boucle au lieu de passer par le threadpool.
+    Tous les handlers qui dépendent de SessionDep sont synchrones (def) :
+    leurs appels supabase bloquants s'exécutent dans le threadpool.
     """
     from ploutos.db import get_db
 
@@ -20,13 +20,18 @@ app = FastAPI(
     version="1.0.0",
 )
 
-# Configuration CORS
+# Configuration CORS : listes explicites figées au démarrage (pas de "*",
+# Starlette n'a alors pas à refléter les en-têtes à chaque preflight)
+CORS_ORIGINS = tuple(settings.CORS_ORIGINS)
+ALLOWED_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+ALLOWED_HEADERS = ("Authorization", "Content-Type", "Accept")
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=ALLOWED_METHODS,
+    allow_headers=ALLOWED_HEADERS,
 )
 
 # Inclusion des routeurs
@@ -48,7 +48,7 @@ class DeferredAccountsResponse(BaseModel):
 
 
 @router.get("/accounts", response_model=list[AccountResponse])
-async def get_accounts(db: SessionDep, include_archived: bool = False):
+def get_accounts(db: SessionDep, include_archived: bool = False):
     query = db.table("Accounts").select("*")
     if not include_archived:
         query = query.eq("active", True)
@@ -57,7 +57,7 @@ async def get_accounts(db: SessionDep, include_archived: bool = False):
 
 
 @router.post("/create-account", response_model=AccountResponse)
-async def create_account(account: AccountCreate, db: SessionDep):
+def create_account(account: AccountCreate, db: SessionDep):
     # Check if account with same name already exists
     existing_account = (
         db.table("Accounts")
@@ -99,7 +99,7 @@ async def create_account(account: AccountCreate, db: SessionDep):
 
 
 @router.put("/accounts/{account_id}", response_model=AccountResponse)
-async def update_account(account_id: str, account: AccountUpdate, db: SessionDep):
+def update_account(account_id: str, account: AccountUpdate, db: SessionDep):
     current_time = datetime.now().isoformat()
 
     # Update the Account
@@ -128,7 +128,7 @@ async def update_account(account_id: str, account: AccountUpdate, db: SessionDep
 
 
 @router.delete("/accounts/{account_id}")
-async def delete_account(account_id: str, db: SessionDep):
+def delete_account(account_id: str, db: SessionDep):
     # Check if account exists
     account = db.table("Accounts").select("*").eq("accountId", account_id).execute()
     if not account.data:
@@ -170,7 +170,7 @@ async def delete_account(account_id: str, db: SessionDep):
 
 
 @router.patch("/accounts/{account_id}/archive", response_model=AccountResponse)
-async def toggle_archive_account(account_id: str, db: SessionDep):
+def toggle_archive_account(account_id: str, db: SessionDep):
     # Get current account state
     current = (
         db.table("Accounts").select("active").eq("accountId", account_id).execute()
@@ -195,7 +195,7 @@ async def toggle_archive_account(account_id: str, db: SessionDep):
 
 
 @router.get("/accounts/current-amounts", response_model=list[AccountAmount])
-async def get_current_amounts(db: SessionDep, include_archived: bool = False):
+def get_current_amounts(db: SessionDep, include_archived: bool = False):
     # Get all real accounts
     accounts_response = db.table("Accounts").select("*").execute()
 
@@ -245,7 +245,7 @@ async def get_current_amounts(db: SessionDep, include_archived: bool = False):
 
 
 @router.get("/accounts/deferred", response_model=DeferredAccountsResponse)
-async def get_deferred_accounts(db: SessionDep):
+def get_deferred_accounts(db: SessionDep):
     """Get prepaid expenses (CCA) and deferred revenue (PCA) balances.
 
     Prepaid Expenses (CCA): credit slaves where master date <= NOW and slave date > NOW
@@ -328,7 +328,7 @@ class PatrimonyTimelineEntry(BaseModel):
 
 
 @router.get("/accounts/patrimony-timeline", response_model=List[PatrimonyTimelineEntry])
-async def get_patrimony_timeline(
+def get_patrimony_timeline(
     db: SessionDep,
     start_date: str,  # YYYY-MM-DD
     end_date: str,  # YYYY-MM-DD
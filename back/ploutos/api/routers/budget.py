@@ -64,7 +64,7 @@ class BudgetComparisonResponse(BaseModel):
 
 
 @router.get("/budget/{year}", response_model=list[BudgetResponse])
-async def get_budgets_by_year(year: int, db: SessionDep):
+def get_budgets_by_year(year: int, db: SessionDep):
     """Get all budgets for a given year.
 
     Returns all virtual accounts (is_real = false) with their budget for the year.
@@ -100,7 +100,7 @@ async def get_budgets_by_year(year: int, db: SessionDep):
 
 
 @router.put("/budget")
-async def upsert_budget(budget: BudgetUpsert, db: SessionDep):
+def upsert_budget(budget: BudgetUpsert, db: SessionDep):
     """Create or update a budget.
 
     Validates that the account is a virtual account (is_real = false).
@@ -145,7 +145,7 @@ async def upsert_budget(budget: BudgetUpsert, db: SessionDep):
 @router.get(
     "/budget/{year}/consumption", response_model=list[BudgetConsumptionResponse]
 )
-async def get_budget_consumption(year: int, db: SessionDep):
+def get_budget_consumption(year: int, db: SessionDep):
     """Get budget consumption status for a given year.
 
     Calculates spending from TransactionsSlaves for each virtual account
@@ -207,7 +207,7 @@ async def get_budget_consumption(year: int, db: SessionDep):
     "/budget-comparison/{year}/{month}",
     response_model=list[BudgetComparisonResponse],
 )
-async def get_budget_comparison(year: int, month: int, db: SessionDep):
+def get_budget_comparison(year: int, month: int, db: SessionDep):
     """Compare spending between the same month in current year and previous year.
 
     Returns spending comparison for each virtual account that has spending
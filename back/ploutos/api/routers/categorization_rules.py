@@ -14,7 +14,7 @@ router = APIRouter()
 
 
 @router.get("/categorization-rules", response_model=List[CategorizationRule])
-async def get_categorization_rules(db: SessionDep):
+def get_categorization_rules(db: SessionDep):
     """Get all categorization rules ordered by priority (descending).
 
     Returns:
@@ -38,7 +38,7 @@ async def get_categorization_rules(db: SessionDep):
 @router.post(
     "/categorization-rules", response_model=CategorizationRule, status_code=201
 )
-async def create_categorization_rule(rule: CategorizationRuleCreate, db: SessionDep):
+def create_categorization_rule(rule: CategorizationRuleCreate, db: SessionDep):
     """Create a new categorization rule.
 
     Args:
@@ -71,7 +71,7 @@ async def create_categorization_rule(rule: CategorizationRuleCreate, db: Session
 
 
 @router.put("/categorization-rules/{rule_id}", response_model=CategorizationRule)
-async def update_categorization_rule(
+def update_categorization_rule(
     rule_id: UUID, rule: CategorizationRuleCreate, db: SessionDep
 ):
     """Update an existing categorization rule.
@@ -127,7 +127,7 @@ async def update_categorization_rule(
 
 
 @router.delete("/categorization-rules/{rule_id}", status_code=204)
-async def delete_categorization_rule(rule_id: UUID, db: SessionDep):
+def delete_categorization_rule(rule_id: UUID, db: SessionDep):
     """Delete a categorization rule.
 
     Args:
@@ -164,7 +164,7 @@ async def delete_categorization_rule(rule_id: UUID, db: SessionDep):
 @router.patch(
     "/categorization-rules/{rule_id}/toggle", response_model=CategorizationRule
 )
-async def toggle_categorization_rule(rule_id: UUID, db: SessionDep):
+def toggle_categorization_rule(rule_id: UUID, db: SessionDep):
     """Toggle a categorization rule's enabled status.
 
     Args:
@@ -76,7 +76,7 @@ class MatchingPreviewResult(BaseModel):
 
 
 @router.post("/matching/process", response_model=MatchingProcessResult)
-async def process_matching(db: SessionDep):
+def process_matching(db: SessionDep):
     """Apply all enabled categorization rules to uncategorized transactions.
 
     NEW ARCHITECTURE:
@@ -128,7 +128,7 @@ async def process_matching(db: SessionDep):
             )
 
             # MATCHING: Find transactions matching this rule using SQL filters
-            matched_txs = await find_matching_transactions(db, rule)
+            matched_txs = find_matching_transactions(db, rule)
 
             if not matched_txs:
                 logger.debug(f"No matches found for rule '{rule['description']}'")
@@ -156,7 +156,7 @@ async def process_matching(db: SessionDep):
                     processor_config = rule.get("processor_config", {})
 
                     # Apply processor to transaction (handles DB updates)
-                    processor_result = await apply_processor_to_transaction(
+                    processor_result = apply_processor_to_transaction(
                         db, tx, processor_type, processor_config
                     )
                     if processor_result["success"]:
@@ -212,7 +212,7 @@ async def process_matching(db: SessionDep):
 
 
 @router.get("/matching/stats", response_model=MatchingStats)
-async def get_matching_stats(db: SessionDep):
+def get_matching_stats(db: SessionDep):
     """Get statistics about categorization rules and uncategorized transactions.
 
     Returns:
@@ -229,7 +229,7 @@ async def get_matching_stats(db: SessionDep):
         )
 
         # Get uncategorized transactions count
-        uncategorized_count = await count_uncategorized_transactions(db)
+        uncategorized_count = count_uncategorized_transactions(db)
 
         return MatchingStats(
             total_enabled_rules=len(rules_response.data),
@@ -243,7 +243,7 @@ async def get_matching_stats(db: SessionDep):
 
 
 @router.get("/matching/preview/{rule_id}", response_model=MatchingPreviewResult)
-async def preview_rule_matching(rule_id: str, db: SessionDep):
+def preview_rule_matching(rule_id: str, db: SessionDep):
     """Preview which transactions would match a specific rule (dry-run).
 
     This endpoint shows which transactions would be affected by a rule
@@ -269,7 +269,7 @@ async def preview_rule_matching(rule_id: str, db: SessionDep):
         logger.info(f"Previewing rule: '{rule['description']}'")
 
         # Find matching transactions using existing logic
-        matched_txs = await find_matching_transactions(db, rule)
+        matched_txs = find_matching_transactions(db, rule)
 
         # Get processor to calculate projected slaves
         processor_type = rule.get("processor_type", "simple_split")
@@ -59,7 +59,7 @@ class PaginatedTransactions(BaseModel):
 
 
 @router.get("/transactions", response_model=PaginatedTransactions)
-async def get_transactions(
+def get_transactions(
     db: SessionDep,
     date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
@@ -111,7 +111,7 @@ async def get_transactions(
 
 
 @router.put("/transactions/{transaction_id}", response_model=TransactionUpdate)
-async def update_transaction(
+def update_transaction(
     transaction_id: UUID,
     transaction_update: TransactionUpdate,
     db: SessionDep,
@@ -156,7 +156,7 @@ async def update_transaction(
 @router.put(
     "/transactions/{transaction_id}/slaves", response_model=List[TransactionSlaveUpdate]
 )
-async def update_transaction_slaves(
+def update_transaction_slaves(
     transaction_id: UUID,
     slaves_update: TransactionSlavesUpdate,
     db: SessionDep,
@@ -257,7 +257,7 @@ async def update_transaction_slaves(
 
 
 @router.post("/transactions/{transaction_id}/split-slave/{slave_id}", status_code=201)
-async def split_slave(transaction_id: UUID, slave_id: UUID, db: SessionDep):
+def split_slave(transaction_id: UUID, slave_id: UUID, db: SessionDep):
     """Split un slave pointant vers un compte réel en une nouvelle transaction.
 
     Utilisé pour dé-merger un transfert (réversibilité).
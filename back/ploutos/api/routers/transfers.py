@@ -17,7 +17,7 @@ router = APIRouter()
 
 
 @router.get("/transfers/candidates", response_model=list[TransferCandidate])
-async def get_transfer_candidates(db: SessionDep):
+def get_transfer_candidates(db: SessionDep):
     """Détecte automatiquement les paires de transactions candidates pour un transfert.
 
     Utilise la fonction RPC `get_transfer_candidates` qui applique les critères :
@@ -92,7 +92,7 @@ async def get_transfer_candidates(db: SessionDep):
 
 
 @router.post("/transfers/merge")
-async def merge_transfer(request: TransferMergeRequest, db: SessionDep):
+def merge_transfer(request: TransferMergeRequest, db: SessionDep):
     """Merge deux transactions en un transfert.
 
     Logique :
@@ -107,33 +107,28 @@ async def merge_transfer(request: TransferMergeRequest, db: SessionDep):
         Transaction crédit mise à jour avec le nouveau slave
     """
     try:
-        # Récupérer les deux transactions
-        credit_response = (
+        # Récupérer les deux transactions en une seule requête
+        credit_id = str(request.credit_transaction_id)
+        debit_id = str(request.debit_transaction_id)
+        pair_response = (
             db.table("Transactions")
             .select("""
             *,
             TransactionsSlaves (*)
         """)
-            .eq("transactionId", request.credit_transaction_id)
+            .in_("transactionId", [credit_id, debit_id])
             .execute()
         )
+        by_id = {tx["transactionId"]: tx for tx in pair_response.data}
 
-        if not credit_response.data:
+        credit_tx = by_id.get(credit_id)
+        if credit_tx is None:
             raise HTTPException(status_code=404, detail="Credit transaction not found")
 
-        debit_response = (
-            db.table("Transactions")
-            .select("*")
-            .eq("transactionId", request.debit_transaction_id)
-            .execute()
-        )
-
-        if not debit_response.data:
+        debit_tx = by_id.get(debit_id)
+        if debit_tx is None:
             raise HTTPException(status_code=404, detail="Debit transaction not found")
 
-        credit_tx = credit_response.data[0]
-        debit_tx = debit_response.data[0]
-
         # Validations
         if credit_tx["amount"] != debit_tx["amount"]:
             logger.error(
@@ -246,7 +241,7 @@ async def merge_transfer(request: TransferMergeRequest, db: SessionDep):
 
 
 @router.get("/transfers", response_model=list[dict[str, Any]])
-async def get_transfers(db: SessionDep):
+def get_transfers(db: SessionDep):
     """Liste tous les transferts confirmés.
 
     Un transfert = une transaction avec au moins un slave pointant vers un compte réel.
@@ -315,7 +310,7 @@ async def get_transfers(db: SessionDep):
 
 
 @router.post("/transfers/candidates/reject", status_code=201)
-async def reject_transfer_candidate(
+def reject_transfer_candidate(
     request: RejectedTransferPairCreate, db: SessionDep
 ) -> dict[str, Any]:
     """Rejeter une paire de transactions candidates.
@@ -379,7 +374,7 @@ async def reject_transfer_candidate(
 
 
 @router.delete("/transfers/candidates/reject/{tx1_id}/{tx2_id}", status_code=204)
-async def unreject_transfer_candidate(tx1_id: str, tx2_id: str, db: SessionDep):
+def unreject_transfer_candidate(tx1_id: str, tx2_id: str, db: SessionDep):
     """Annuler le rejet d'une paire de transactions.
 
     Supprime le rejet pour que la paire réapparaisse dans les candidats.
@@ -426,7 +421,7 @@ async def unreject_transfer_candidate(tx1_id: str, tx2_id: str, db: SessionDep):
 
 
 @router.get("/transfers/candidates/rejected", response_model=list[dict[str, Any]])
-async def get_rejected_transfer_candidates(db: SessionDep):
+def get_rejected_transfer_candidates(db: SessionDep):
     """Lister toutes les paires de transferts rejetées.
 
     Returns:
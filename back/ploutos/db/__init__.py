@@ -1,11 +1,23 @@
 from ploutos.config.settings import get_settings
 from supabase import Client, create_client
 
-# Initialisation du client Supabase
-settings = get_settings()
-get_db: Client = create_client(
-    settings.supabase_url, settings.supabase_secret.get_secret_value()
-)
 
-# Export du client pour qu'il soit accessible via `from ploutos.db import client`
+def __getattr__(name: str) -> Client:
+    """Crée le client Supabase au premier accès à `ploutos.db.get_db`.
+
+    Importer `ploutos.db.models` charge ce package : la création paresseuse
+    évite de construire un client tant que personne ne s'en sert.
+    """
+    if name != "get_db":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    settings = get_settings()
+    client = create_client(
+        settings.supabase_url, settings.supabase_secret.get_secret_value()
+    )
+    # Les accès suivants trouvent l'attribut sans repasser par __getattr__
+    globals()["get_db"] = client
+    return client
+
+
+# Export du client pour qu'il soit accessible via `from ploutos.db import get_db`
 __all__ = ["get_db"]
@@ -2,6 +2,8 @@
 
 import re
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 from typing import List
 
 from loguru import logger
@@ -15,7 +17,7 @@ from ploutos.db.models import (
 from ploutos.processors.base import get_processor
 
 
-async def apply_processor_to_transaction(
+def apply_processor_to_transaction(
     db,
     transaction: TransactionWithSlaves,
     processor_type: str,
@@ -164,27 +166,164 @@ def _is_regex_condition(condition: dict) -> bool:
     return condition.get("match_type") == MatchType.REGEX.value
 
 
-def _apply_regex_filter_python(
-    transactions: List[dict], regex_pattern: str
+def _dedupe_conditions(conditions: List[dict]) -> List[dict]:
+    """Drop repeated conditions (same match_type and match_value), keeping order."""
+    seen = set()
+    unique = []
+    for condition in conditions:
+        key = (condition["match_type"], condition["match_value"])
+        if key not in seen:
+            seen.add(key)
+            unique.append(condition)
+    return unique
+
+
+_AMOUNT_OPERATORS = {
+    MatchType.AMOUNT_GT.value: "gt",
+    MatchType.AMOUNT_LT.value: "lt",
+    MatchType.AMOUNT_GTE.value: "gte",
+    MatchType.AMOUNT_LTE.value: "lte",
+    MatchType.AMOUNT_EQ.value: "eq",
+}
+
+
+def _quote_filter_value(value: str) -> str:
+    """Quote a value for use inside a PostgREST logic tree (or/and filters)."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _condition_to_filter(condition: dict) -> str | None:
+    """Translate a condition to a PostgREST filter expression.
+
+    Same semantics as _apply_condition_filter, but expressed in the PostgREST
+    logic tree syntax so several conditions can be combined in a single query.
+
+    Args:
+        condition: Dict with match_type and match_value
+
+    Returns:
+        Filter expression (e.g. 'amount.gt.100'), or None if condition is regex
+    """
+    match_type = condition["match_type"]
+    value = condition["match_value"]
+
+    if match_type == MatchType.CONTAINS.value:
+        return f"description.ilike.{_quote_filter_value(f'*{value}*')}"
+    elif match_type == MatchType.STARTS_WITH.value:
+        return f"description.ilike.{_quote_filter_value(f'{value}*')}"
+    elif match_type == MatchType.EXACT.value:
+        return f"description.ilike.{_quote_filter_value(value)}"
+    elif match_type == MatchType.REGEX.value:
+        # Regex is handled separately via RPC, skip here
+        return None
+    elif match_type in _AMOUNT_OPERATORS:
+        return f"amount.{_AMOUNT_OPERATORS[match_type]}.{float(value)}"
+    else:
+        raise ValueError(f"Unknown match type: {match_type}")
+
+
+def _group_to_filter(group_operator: str, conditions: List[dict]) -> str:
+    """Combine the conditions of a group into a single PostgREST expression.
+
+    Args:
+        group_operator: Group operator (and/or)
+        conditions: Non-regex conditions of the group
+
+    Returns:
+        Expression such as 'and(description.ilike."*AMAZON*",amount.gt.100.0)'
+    """
+    filters = [_condition_to_filter(c) for c in conditions]
+    if len(filters) == 1:
+        return filters[0]
+    keyword = "and" if group_operator == LogicalOperator.AND.value else "or"
+    return f"{keyword}({','.join(filters)})"
+
+
+def _fetch_all_pages(
+    db,
+    rule: dict,
+    page_size: int,
+    and_conditions: List[dict] | None = None,
+    or_filter: str | None = None,
 ) -> List[dict]:
-    """Apply regex filter in Python on transaction descriptions.
+    """Fetch all Unknown transactions of a rule, optionally filtered.
 
     Args:
-        transactions: List of transaction dicts
-        regex_pattern: Regex pattern to match
+        db: Supabase client
+        rule: Rule for base query filters
+        page_size: Number of results per page
+        and_conditions: Non-regex conditions chained on the query (AND logic)
+        or_filter: Optional PostgREST logic tree applied with .or_()
 
     Returns:
-        Filtered list of transactions matching the regex
+        List of transactions with exactly one slave
     """
-    try:
-        pattern = re.compile(regex_pattern, re.IGNORECASE)
-        return [tx for tx in transactions if pattern.search(tx.get("description", ""))]
-    except re.error as e:
-        logger.error(f"Invalid regex pattern '{regex_pattern}': {e}")
-        return []
+    all_matched = []
+    offset = 0
+
+    while True:
+        query = _build_base_query(db, rule)
+
+        # Chain all non-regex conditions (AND logic)
+        for condition in and_conditions or []:
+            result = _apply_condition_filter(query, condition)
+            if result is not None:
+                query = result
 
+        if or_filter is not None:
+            query = query.or_(or_filter)
 
-async def _fetch_regex_matches_rpc(db, regex_pattern: str, rule: dict) -> List[dict]:
+        response = query.range(offset, offset + page_size - 1).execute()
+
+        if not response.data:
+            break
+
+        all_matched.extend(_filter_single_slave(response.data))
+
+        if len(response.data) < page_size:
+            break
+
+        offset += page_size
+
+    return all_matched
+
+
+@lru_cache(maxsize=4096)
+def _compile_regex(pattern: str) -> re.Pattern:
+    """Compile a case-insensitive regex pattern, cached across rule evaluations."""
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _apply_regex_filters(
+    transactions: List[dict], regex_conditions: List[dict]
+) -> List[dict]:
+    """Keep the transactions whose description matches ALL regex conditions.
+
+    Patterns are compiled once (cached) and checked in a single pass.
+
+    Args:
+        transactions: List of transaction dicts
+        regex_conditions: Regex conditions to AND together
+
+    Returns:
+        Filtered list of transactions, in their original order
+    """
+    searches = []
+    for condition in regex_conditions:
+        try:
+            searches.append(_compile_regex(condition["match_value"]).search)
+        except re.error as e:
+            logger.error(f"Invalid regex pattern '{condition['match_value']}': {e}")
+            return []
+    return [
+        tx
+        for tx in transactions
+        if all(search(tx.get("description") or "") for search in searches)
+    ]
+
+
+def _fetch_regex_matches_rpc(db, regex_pattern: str, rule: dict) -> List[dict]:
     """Fetch transactions matching regex using RPC function.
 
     Args:
@@ -237,13 +376,14 @@ def _filter_single_slave(transactions: List[dict]) -> List[dict]:
     return [tx for tx in transactions if len(tx.get("TransactionsSlaves", [])) == 1]
 
 
-async def _match_and_conditions(
+def _match_and_conditions(
     db, rule: dict, conditions: List[dict], page_size: int
 ) -> List[dict]:
     """Match transactions where ALL conditions are true (AND logic).
 
-    Chains all condition filters in a single query.
-    Regex conditions are handled via RPC then filtered in Python.
+    All non-regex filters are chained in a single query. Regex conditions
+    are evaluated in Python on the reduced candidate set (via RPC if only
+    regex).
 
     Args:
         db: Supabase client
@@ -257,6 +397,8 @@ async def _match_and_conditions(
     if not conditions:
         return []
 
+    conditions = _dedupe_conditions(conditions)
+
     # Separate regex and non-regex conditions
     regex_conditions = [c for c in conditions if _is_regex_condition(c)]
     non_regex_conditions = [c for c in conditions if not _is_regex_condition(c)]
@@ -264,100 +406,57 @@ async def _match_and_conditions(
     # If only regex conditions, use RPC for first then filter with others in Python
     if regex_conditions and not non_regex_conditions:
         first_regex = regex_conditions[0]
-        matched = await _fetch_regex_matches_rpc(db, first_regex["match_value"], rule)
-        # Apply remaining regex conditions in Python
-        for cond in regex_conditions[1:]:
-            matched = _apply_regex_filter_python(matched, cond["match_value"])
-        return matched
+        matched = _fetch_regex_matches_rpc(db, first_regex["match_value"], rule)
+        return _apply_regex_filters(matched, regex_conditions[1:])
 
     # Fetch with non-regex conditions via Supabase
-    all_matched = []
-    offset = 0
-
-    while True:
-        query = _build_base_query(db, rule)
-
-        # Chain all non-regex conditions (AND logic)
-        for condition in non_regex_conditions:
-            result = _apply_condition_filter(query, condition)
-            if result is not None:
-                query = result
-
-        response = query.range(offset, offset + page_size - 1).execute()
-
-        if not response.data:
-            break
-
-        filtered = _filter_single_slave(response.data)
-        all_matched.extend(filtered)
-
-        if len(response.data) < page_size:
-            break
-
-        offset += page_size
-
-    # Apply regex conditions in Python if any
-    for cond in regex_conditions:
-        all_matched = _apply_regex_filter_python(all_matched, cond["match_value"])
+    all_matched = _fetch_all_pages(
+        db, rule, page_size, and_conditions=non_regex_conditions
+    )
 
-    return all_matched
+    # Apply regex conditions in Python on the already reduced candidate set
+    return _apply_regex_filters(all_matched, regex_conditions)
 
 
-async def _match_or_conditions(
+def _match_or_conditions(
     db, rule: dict, conditions: List[dict], page_size: int
 ) -> List[dict]:
     """Match transactions where ANY condition is true (OR logic).
 
-    Executes separate queries for each condition and unions results.
-    Regex conditions are handled via RPC.
+    All non-regex conditions are combined in a single query (PostgREST or
+    filter). Regex conditions are matched via RPC, so they keep Postgres
+    POSIX semantics, and the results are unioned.
 
     Args:
         db: Supabase client
         rule: Rule for base query filters
         conditions: List of conditions to OR together
-        page_size: Max results per condition
+        page_size: Number of results per page
 
     Returns:
         List of matching transactions (deduplicated)
     """
-    all_matched = {}
+    if not conditions:
+        return []
 
-    for condition in conditions:
-        # Handle regex conditions via RPC
-        if _is_regex_condition(condition):
-            matched = await _fetch_regex_matches_rpc(db, condition["match_value"], rule)
-            for tx in matched:
-                tx_id = tx["transactionId"]
-                if tx_id not in all_matched:
-                    all_matched[tx_id] = tx
-            continue
-
-        # Handle non-regex conditions via Supabase query
-        offset = 0
-        while True:
-            query = _build_base_query(db, rule)
-            query = _apply_condition_filter(query, condition)
-            response = query.range(offset, offset + page_size - 1).execute()
-
-            if not response.data:
-                break
-
-            for tx in _filter_single_slave(response.data):
-                tx_id = tx["transactionId"]
-                if tx_id not in all_matched:
-                    all_matched[tx_id] = tx
-
-            if len(response.data) < page_size:
-                break
-
-            offset += page_size
+    conditions = _dedupe_conditions(conditions)
+    regex_conditions = [c for c in conditions if _is_regex_condition(c)]
+    non_regex_conditions = [c for c in conditions if not _is_regex_condition(c)]
+
+    results = []
+    if non_regex_conditions:
+        or_filter = _group_to_filter(LogicalOperator.OR.value, non_regex_conditions)
+        results.append(_fetch_all_pages(db, rule, page_size, or_filter=or_filter))
+    for condition in regex_conditions:
+        results.append(_fetch_regex_matches_rpc(db, condition["match_value"], rule))
 
+    all_matched = {}
+    for tx in chain.from_iterable(results):
+        all_matched.setdefault(tx["transactionId"], tx)
     return list(all_matched.values())
 
 
-async def find_matching_transactions(
-    db, rule: dict, page_size: int = 1000
-) -> List[dict]:
+def find_matching_transactions(db, rule: dict, page_size: int = 1000) -> List[dict]:
     """Find transactions matching a rule with compound conditions.
 
     Supports condition_groups with AND/OR logic:
@@ -378,26 +477,38 @@ async def find_matching_transactions(
         logger.warning(f"Rule '{rule.get('description')}' has no condition_groups")
         return []
 
-    all_matched = {}
-
-    # Groups are OR'd together
-    for group in condition_groups:
-        operator = group.get("operator", LogicalOperator.AND.value)
-        conditions = group.get("conditions", [])
-
-        if not conditions:
-            continue
+    groups = [g for g in condition_groups if g.get("conditions")]
 
-        if operator == LogicalOperator.AND.value:
-            matched = await _match_and_conditions(db, rule, conditions, page_size)
-        else:  # OR
-            matched = await _match_or_conditions(db, rule, conditions, page_size)
+    if not groups:
+        return []
 
-        # Union results from all groups
-        for tx in matched:
-            tx_id = tx["transactionId"]
-            if tx_id not in all_matched:
-                all_matched[tx_id] = tx
+    if not any(_is_regex_condition(c) for g in groups for c in g["conditions"]):
+        # Whole rule pushed down to the database in a single query:
+        # groups are OR'd, each group combines its conditions with its operator
+        rule_filter = ",".join(
+            _group_to_filter(
+                g.get("operator", LogicalOperator.AND.value),
+                _dedupe_conditions(g["conditions"]),
+            )
+            for g in groups
+        )
+        results = [_fetch_all_pages(db, rule, page_size, or_filter=rule_filter)]
+    else:
+        # Groups are OR'd together (regex conditions cannot be pushed down)
+        results = []
+        for group in groups:
+            operator = group.get("operator", LogicalOperator.AND.value)
+            conditions = group["conditions"]
+
+            if operator == LogicalOperator.AND.value:
+                results.append(_match_and_conditions(db, rule, conditions, page_size))
+            else:  # OR
+                results.append(_match_or_conditions(db, rule, conditions, page_size))
+
+    # Union results from all groups in a single pass, keyed by transactionId
+    all_matched = {}
+    for tx in chain.from_iterable(results):
+        all_matched.setdefault(tx["transactionId"], tx)
 
     logger.debug(
         f"Matched {len(all_matched)} transactions for rule '{rule.get('description')}'"
@@ -406,7 +517,7 @@ async def find_matching_transactions(
     return list(all_matched.values())
 
 
-async def count_uncategorized_transactions(db) -> int:
+def count_uncategorized_transactions(db) -> int:
     """Count total uncategorized transactions.
 
     Args:
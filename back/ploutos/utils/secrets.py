@@ -1,12 +1,18 @@
 # crypto_utils.py
 from Crypto.Cipher import AES
 import base64
+import time
 from ploutos.config.settings import get_settings
 from ploutos.db import get_db
 from ploutos.db.models import AccountsSecretsCreate
 
 settings = get_settings()
 
+# Durée (en secondes) pendant laquelle un secret déchiffré est réutilisé
+SECRET_TTL = 3600
+# accountId -> (secret, bankId, lu_a)
+_secret_cache: dict[str, tuple[str, str, float]] = {}
+
 
 def encrypt(text: str) -> str:
     """
@@ -42,12 +48,21 @@ def decrypt(encoded: str) -> str:
 def save_secret(account: AccountsSecretsCreate):
     """Sauvegarde le secret chiffré dans la base de données AccountSecrets."""
     account.secretId = encrypt(account.secretId)
+    _secret_cache.pop(str(account.accountId), None)
     get_db.table("AccountSecrets").delete().eq("accountId", account.accountId).execute()
     get_db.table("AccountSecrets").insert(account.model_dump()).execute()
 
 
 def get_secret(accountId: str) -> tuple[str, str]:
-    """Récupère et déchiffre le secret pour un accountId donné. Renvoie (secret, bankId) ou None si non trouvé."""
+    """Récupère et déchiffre le secret pour un accountId donné. Renvoie (secret, bankId) ou None si non trouvé.
+
+    Le résultat est mis en cache SECRET_TTL secondes par accountId.
+    """
+    now = time.monotonic()
+    cached = _secret_cache.get(str(accountId))
+    if cached is not None and now - cached[2] < SECRET_TTL:
+        return cached[0], cached[1]
+
     data = (
         get_db.table("AccountSecrets")
         .select("secretId,bankId")
@@ -57,6 +72,8 @@ def get_secret(accountId: str) -> tuple[str, str]:
     if data.data:
         encrypted_secret = data.data[0]["secretId"]
         decrypted_secret = decrypt(encrypted_secret)
-        return decrypted_secret, data.data[0]["bankId"]
+        bank_id = data.data[0]["bankId"]
+        _secret_cache[str(accountId)] = (decrypted_secret, bank_id, now)
+        return decrypted_secret, bank_id
     else:
         raise ValueError(f"No secret found for account ID: {accountId}")
@@ -1,12 +1,287 @@
 """Fixtures partagées pour les tests."""
 
-from types import SimpleNamespace
+import copy
 from unittest.mock import MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 
+from ploutos.api.deps import get_db_dependency
 from ploutos.api.main import app
+from ploutos.db.models import Account
+
+
+# =============================================================================
+# Données de référence (copiées par les fixtures, ne pas modifier)
+# =============================================================================
+
+_SAMPLE_ACCOUNTS = [
+    {
+        "accountId": "11111111-1111-1111-1111-111111111111",
+        "name": "Banque A",
+        "category": "Banking",
+        "sub_category": "Checking",
+        "is_real": True,
+        "original_amount": 1000.0,
+        "active": True,
+        "created_at": "2025-01-01T00:00:00",
+        "updated_at": "2025-01-01T00:00:00",
+    },
+    {
+        "accountId": "22222222-2222-2222-2222-222222222222",
+        "name": "Banque B",
+        "category": "Banking",
+        "sub_category": "Checking",
+        "is_real": True,
+        "original_amount": 500.0,
+        "active": True,
+        "created_at": "2025-01-01T00:00:00",
+        "updated_at": "2025-01-01T00:00:00",
+    },
+]
+
+_SAMPLE_UNKNOWN_ACCOUNT = {
+    "accountId": "99999999-9999-9999-9999-999999999999",
+    "name": "Unknown",
+    "category": "Virtual",
+    "sub_category": "Uncategorized",
+    "is_real": False,
+    "original_amount": 0.0,
+    "active": True,
+    "created_at": "2025-01-01T00:00:00",
+    "updated_at": "2025-01-01T00:00:00",
+}
+
+_CORRECT_UNKNOWN_ACCOUNT = {
+    "accountId": "99999999-9999-9999-9999-999999999999",
+    "name": "Unknown",
+    "category": "Unknown",
+    "sub_category": "Unknown",
+    "is_real": False,
+    "original_amount": 0.0,
+    "active": True,
+    "created_at": "2025-01-01T00:00:00",
+    "updated_at": "2025-01-01T00:00:00",
+}
+
+_SAMPLE_MERGED_TRANSACTION = {
+    "transactionId": "cccccccc-cccc-cccc-cccc-cccccccccccc",
+    "description": "Transfert vers Banque B",
+    "date": "2025-01-10T00:00:00",
+    "type": "credit",
+    "amount": 100.0,
+    "accountId": _SAMPLE_ACCOUNTS[0]["accountId"],  # Banque A
+    "created_at": "2025-01-10T00:00:00",
+    "updated_at": "2025-01-10T00:00:00",
+    "TransactionsSlaves": [
+        {
+            "slaveId": "cccccccc-cccc-cccc-cccc-dddddddddddd",
+            "type": "debit",
+            "amount": 100.0,  # Montant positif pour le slave
+            "date": "2025-01-10T00:00:00",
+            "accountId": _SAMPLE_ACCOUNTS[1]["accountId"],  # Banque B (compte réel!)
+            "masterId": "cccccccc-cccc-cccc-cccc-cccccccccccc",
+            "Accounts": {
+                "is_real": True,  # Compte réel = indicateur de transfert
+                "name": "Banque B",
+            },
+        }
+    ],
+}
+
+_SAMPLE_TRANSFER_PAIR = {
+    "negative": {
+        "transactionId": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa",
+        "description": "Virement vers Banque B",
+        "date": "2025-01-15T00:00:00",
+        "type": "credit",  # Sortie d'argent
+        "amount": 100.0,
+        "accountId": _SAMPLE_ACCOUNTS[0]["accountId"],  # Banque A
+        "created_at": "2025-01-15T00:00:00",
+        "updated_at": "2025-01-15T00:00:00",
+        "TransactionsSlaves": [
+            {
+                "slaveId": "aaaaaaaa-aaaa-aaaa-aaaa-bbbbbbbbbbbb",
+                "type": "debit",  # Type inversé
+                "amount": 100.0,  # Montant négatif
+                "date": "2025-01-15T00:00:00",
+                "accountId": _CORRECT_UNKNOWN_ACCOUNT["accountId"],
+                "masterId": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa",
+                "Accounts": {"is_real": False, "name": "Unknown"},
+            }
+        ],
+    },
+    "positive": {
+        "transactionId": "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb",
+        "description": "Virement depuis Banque A",
+        "date": "2025-01-15T00:00:00",
+        "type": "debit",  # Entrée d'argent
+        "amount": 100.0,
+        "accountId": _SAMPLE_ACCOUNTS[1]["accountId"],  # Banque B
+        "created_at": "2025-01-15T00:00:00",
+        "updated_at": "2025-01-15T00:00:00",
+        "TransactionsSlaves": [
+            {
+                "slaveId": "bbbbbbbb-bbbb-bbbb-bbbb-cccccccccccc",
+                "type": "credit",  # Type inversé
+                "amount": 100.0,  # Montant négatif
+                "date": "2025-01-15T00:00:00",
+                "accountId": _CORRECT_UNKNOWN_ACCOUNT["accountId"],
+                "masterId": "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb",
+                "Accounts": {"is_real": False, "name": "Unknown"},
+            }
+        ],
+    },
+}
+
+
+# =============================================================================
+# Client Supabase factice
+# =============================================================================
+
+
+class FakeResponse:
+    """Réponse Supabase factice : expose .data (et .count si fourni)."""
+
+    __slots__ = ("data", "count")
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+# Réponse vide partagée (cas le plus fréquent) : ne pas modifier son .data
+_EMPTY_RESPONSE = FakeResponse([])
+
+
+class FakeCall:
+    """Appel reçu par le client factice : opération, payload et filtres.
+
+    Les filtres sont enregistrés dans l'ordre, par exemple
+    ("eq", "transactionId", "...") ou ("in", "transactionId", [...]).
+    """
+
+    __slots__ = ("table", "op", "payload", "filters")
+
+    def __init__(self, table, op, payload):
+        self.table = table
+        self.op = op
+        self.payload = payload
+        self.filters = []
+
+
+class _FakeTable:
+    """Chaîne de requête factice pour une table (ou une RPC).
+
+    Chaque méthode du query builder renvoie self ; execute() lit la réponse
+    enregistrée pour (table, opération) dans le client parent. Une méthode
+    non implémentée lève AttributeError au lieu d'être créée à la volée.
+    """
+
+    __slots__ = ("_client", "_name", "_op", "_call")
+
+    def __init__(self, client, name):
+        self._client = client
+        self._name = name
+        self._op = "select"
+        self._call = None
+
+    def _start(self, op, payload=None):
+        self._op = op
+        self._call = FakeCall(self._name, op, payload)
+        self._client.calls.append(self._call)
+        return self
+
+    def _filter(self, *spec):
+        self._call.filters.append(spec)
+        return self
+
+    def select(self, *args, **kwargs):
+        return self._start("select")
+
+    def insert(self, data, *args, **kwargs):
+        return self._start("insert", data)
+
+    def update(self, data, *args, **kwargs):
+        return self._start("update", data)
+
+    def upsert(self, data, *args, **kwargs):
+        return self._start("upsert", data)
+
+    def delete(self, *args, **kwargs):
+        return self._start("delete")
+
+    def eq(self, column, value):
+        return self._filter("eq", column, value)
+
+    def in_(self, column, values):
+        return self._filter("in", column, list(values))
+
+    def single(self):
+        return self._filter("single")
+
+    def execute(self):
+        return self._client._next_response(self._name, self._op)
+
+
+class _FakeTables(dict):
+    """Tables factices par nom, créées à la première demande."""
+
+    def __init__(self, client):
+        super().__init__()
+        self._client = client
+
+    def __missing__(self, name):
+        table = self[name] = _FakeTable(self._client, name)
+        return table
+
+
+class FakeSupabase:
+    """Client Supabase minimal en pur Python (pas de MagicMock).
+
+    Les réponses sont enregistrées par (table, opération) via respond() ;
+    plusieurs payloads sont renvoyés dans l'ordre, le dernier est répété.
+    Une opération sans réponse enregistrée renvoie data=[].
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.calls = []
+        # table(name) est une lookup de dict (voir _FakeTables.__missing__)
+        self.table = _FakeTables(self).__getitem__
+
+    def respond(self, table, op, *payloads):
+        # Réponses construites une fois ici, pas à chaque execute()
+        self.responses[(table, op)] = [
+            _EMPTY_RESPONSE if data == [] else FakeResponse(data) for data in payloads
+        ]
+
+    def calls_to(self, table, op):
+        """Appels (table, op) reçus (FakeCall), dans l'ordre."""
+        return [c for c in self.calls if c.table == table and c.op == op]
+
+    def called(self, table, op):
+        """True si (table, op) a été appelé au moins une fois."""
+        return any(c.table == table and c.op == op for c in self.calls)
+
+    def reset(self):
+        self.responses.clear()
+        self.calls.clear()
+
+    def rpc(self, name, *args, **kwargs):
+        return self.table(name)._start("rpc", args[0] if args else None)
+
+    def _next_response(self, table, op):
+        queue = self.responses.get((table, op))
+        if not queue:
+            return _EMPTY_RESPONSE
+        return queue.pop(0) if len(queue) > 1 else queue[0]
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
 
 
 @pytest.fixture
@@ -15,62 +290,65 @@ def mock_db():
     return MagicMock()
 
 
-@pytest.fixture
-def test_client(mock_db, monkeypatch):
-    """Client de test FastAPI avec mock DB."""
-    # Patcher directement l'objet get_db dans le module ploutos.db
-    import ploutos.db
+@pytest.fixture(scope="session")
+def fake_supabase():
+    """Client Supabase factice partagé entre tous les tests."""
+    return FakeSupabase()
+
 
-    monkeypatch.setattr(ploutos.db, "get_db", mock_db)
+@pytest.fixture(autouse=True)
+def _reset_fake_supabase(fake_supabase):
+    """Vide les réponses et appels enregistrés avant chaque test."""
+    fake_supabase.reset()
 
-    # Créer le client de test
+
+@pytest.fixture(scope="session")
+def _session_client():
+    """TestClient FastAPI construit une seule fois pour toute la session."""
     with TestClient(app) as client:
         yield client
 
 
+@pytest.fixture
+def test_client(_session_client, mock_db):
+    """Client de test FastAPI avec mock DB.
+
+    La dépendance DB est surchargée pour ce test puis retirée.
+    """
+    app.dependency_overrides[get_db_dependency] = lambda: mock_db
+    yield _session_client
+    app.dependency_overrides.pop(get_db_dependency, None)
+
+
+@pytest.fixture
+async def async_client(mock_db):
+    """Client HTTP asynchrone appelant l'app ASGI en direct, sans thread.
+
+    Même surcharge de la dépendance DB que test_client.
+    """
+    app.dependency_overrides[get_db_dependency] = lambda: mock_db
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.pop(get_db_dependency, None)
+
+
 @pytest.fixture
 def sample_accounts():
-    """Deux comptes bancaires réels pour les tests de transfert."""
-    return [
-        {
-            "accountId": "11111111-1111-1111-1111-111111111111",
-            "name": "Banque A",
-            "category": "Banking",
-            "sub_category": "Checking",
-            "is_real": True,
-            "original_amount": 1000.0,
-            "active": True,
-            "created_at": "2025-01-01T00:00:00",
-            "updated_at": "2025-01-01T00:00:00",
-        },
-        {
-            "accountId": "22222222-2222-2222-2222-222222222222",
-            "name": "Banque B",
-            "category": "Banking",
-            "sub_category": "Checking",
-            "is_real": True,
-            "original_amount": 500.0,
-            "active": True,
-            "created_at": "2025-01-01T00:00:00",
-            "updated_at": "2025-01-01T00:00:00",
-        },
-    ]
+    """Deux comptes bancaires réels pour les tests de transfert.
+
+    Copie profonde propre au test : modifiable sans .copy().
+    """
+    return copy.deepcopy(_SAMPLE_ACCOUNTS)
 
 
 @pytest.fixture
 def sample_unknown_account():
-    """Compte virtuel 'Unknown' pour les transactions non catégorisées."""
-    return {
-        "accountId": "99999999-9999-9999-9999-999999999999",
-        "name": "Unknown",
-        "category": "Virtual",
-        "sub_category": "Uncategorized",
-        "is_real": False,
-        "original_amount": 0.0,
-        "active": True,
-        "created_at": "2025-01-01T00:00:00",
-        "updated_at": "2025-01-01T00:00:00",
-    }
+    """Compte virtuel 'Unknown' pour les transactions non catégorisées.
+
+    Copie profonde propre au test : modifiable sans .copy().
+    """
+    return copy.deepcopy(_SAMPLE_UNKNOWN_ACCOUNT)
 
 
 @pytest.fixture
@@ -80,111 +358,114 @@ def correct_unknown_account():
     ATTENTION: Diffère de sample_unknown_account qui a category="Virtual" et
     sub_category="Uncategorized". La validation dans TransactionProcessor._validate_transaction
     exige category="Unknown" et sub_category="Unknown".
+
+    Copie profonde propre au test : modifiable sans .copy().
     """
-    return {
-        "accountId": "99999999-9999-9999-9999-999999999999",
-        "name": "Unknown",
-        "category": "Unknown",
-        "sub_category": "Unknown",
-        "is_real": False,
-        "original_amount": 0.0,
-        "active": True,
-        "created_at": "2025-01-01T00:00:00",
-        "updated_at": "2025-01-01T00:00:00",
-    }
+    return copy.deepcopy(_CORRECT_UNKNOWN_ACCOUNT)
+
+
+@pytest.fixture(scope="session")
+def unknown_account_obj():
+    """Account Pydantic construit une seule fois depuis correct_unknown_account.
+
+    Partagé par toute la session : ne pas le modifier.
+    """
+    return Account(**_CORRECT_UNKNOWN_ACCOUNT)
+
+
+@pytest.fixture(scope="session")
+def real_bank_account():
+    """Account Pydantic construit une seule fois depuis sample_accounts[0].
+
+    Partagé par toute la session : ne pas le modifier.
+    """
+    return Account(**_SAMPLE_ACCOUNTS[0])
 
 
 @pytest.fixture
-def sample_transfer_pair(sample_accounts, sample_unknown_account):
+def sample_transfer_pair():
     """Paire de transactions valides représentant un transfert.
 
     Transaction 1 (crédit/sortie) : Banque A, -100€
     Transaction 2 (débit/entrée) : Banque B, +100€
     Les deux ont des slaves vers Unknown.
+    Copie profonde propre au test : modifiable sans .copy().
     """
-    return {
-        "negative": {
-            "transactionId": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa",
-            "description": "Virement vers Banque B",
-            "date": "2025-01-15T00:00:00",
-            "type": "credit",  # Sortie d'argent
-            "amount": 100.0,
-            "accountId": sample_accounts[0]["accountId"],  # Banque A
-            "created_at": "2025-01-15T00:00:00",
-            "updated_at": "2025-01-15T00:00:00",
-            "TransactionsSlaves": [
-                {
-                    "slaveId": "aaaaaaaa-aaaa-aaaa-aaaa-bbbbbbbbbbbb",
-                    "type": "debit",  # Type inversé
-                    "amount": 100.0,  # Montant négatif
-                    "date": "2025-01-15T00:00:00",
-                    "accountId": sample_unknown_account["accountId"],
-                    "masterId": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa",
-                    "Accounts": {"is_real": False, "name": "Unknown"},
-                }
-            ],
-        },
-        "positive": {
-            "transactionId": "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb",
-            "description": "Virement depuis Banque A",
-            "date": "2025-01-15T00:00:00",
-            "type": "debit",  # Entrée d'argent
-            "amount": 100.0,
-            "accountId": sample_accounts[1]["accountId"],  # Banque B
-            "created_at": "2025-01-15T00:00:00",
-            "updated_at": "2025-01-15T00:00:00",
-            "TransactionsSlaves": [
-                {
-                    "slaveId": "bbbbbbbb-bbbb-bbbb-bbbb-cccccccccccc",
-                    "type": "credit",  # Type inversé
-                    "amount": 100.0,  # Montant négatif
-                    "date": "2025-01-15T00:00:00",
-                    "accountId": sample_unknown_account["accountId"],
-                    "masterId": "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb",
-                    "Accounts": {"is_real": False, "name": "Unknown"},
-                }
-            ],
-        },
-    }
+    return copy.deepcopy(_SAMPLE_TRANSFER_PAIR)
 
 
-@pytest.fixture
-def sample_merged_transaction(sample_accounts):
+@pytest.fixture(scope="session")
+def sample_merged_transaction():
     """Transaction déjà mergée avec un slave vers un compte réel.
 
     Représente un transfert déjà traité :
     - Master : Banque A, -100€ (crédit/sortie)
     - Slave : Banque B, +100€ (compte réel)
+
+    Partagée par toute la session : lecture seule. Utiliser
+    mutable_merged_transaction pour la modifier ou la passer à un endpoint
+    qui modifie les données reçues de la DB.
+    """
+    return _SAMPLE_MERGED_TRANSACTION
+
+
+@pytest.fixture(scope="session")
+def split_url():
+    """URL de split d'un slave de sample_merged_transaction.
+
+    Le préfixe (transaction parente) est formaté une seule fois par session.
     """
+    prefix = f"/transactions/{_SAMPLE_MERGED_TRANSACTION['transactionId']}/split-slave/"
+    return lambda slave_id: prefix + str(slave_id)
+
+
+@pytest.fixture(scope="session")
+def sample_split_responses():
+    """Réponses DB du split du slave de sample_merged_transaction.
+
+    Construites une seule fois par session : lecture seule.
+    """
+    slave = _SAMPLE_MERGED_TRANSACTION["TransactionsSlaves"][0]
+    new_transaction = {
+        "transactionId": "dddddddd-dddd-dddd-dddd-dddddddddddd",
+        "accountId": slave["accountId"],
+        "amount": slave["amount"],
+        "type": "debit",  # Inverse de credit
+        "date": slave["date"],
+        "description": (
+            f"Split from transaction {_SAMPLE_MERGED_TRANSACTION['transactionId']}"
+        ),
+    }
     return {
-        "transactionId": "cccccccc-cccc-cccc-cccc-cccccccccccc",
-        "description": "Transfert vers Banque B",
-        "date": "2025-01-10T00:00:00",
-        "type": "credit",
-        "amount": 100.0,
-        "accountId": sample_accounts[0]["accountId"],  # Banque A
-        "created_at": "2025-01-10T00:00:00",
-        "updated_at": "2025-01-10T00:00:00",
-        "TransactionsSlaves": [
-            {
-                "slaveId": "cccccccc-cccc-cccc-cccc-dddddddddddd",
-                "type": "debit",
-                "amount": 100.0,  # Montant positif pour le slave
-                "date": "2025-01-10T00:00:00",
-                "accountId": sample_accounts[1]["accountId"],  # Banque B (compte réel!)
-                "masterId": "cccccccc-cccc-cccc-cccc-cccccccccccc",
-                "Accounts": {
-                    "is_real": True,  # Compte réel = indicateur de transfert
-                    "name": "Banque B",
-                },
-            }
-        ],
+        "new_transaction": new_transaction,
+        # Slave inverse vers le compte d'origine
+        "new_slave": {
+            "slaveId": "eeeeeeee-eeee-eeee-eeee-eeeeeeeeeeee",
+            "masterId": new_transaction["transactionId"],
+            "accountId": _SAMPLE_MERGED_TRANSACTION["accountId"],
+            "amount": slave["amount"],
+            "type": "credit",
+        },
+        # UPDATE du slave original (pointé vers Unknown)
+        "updated_slave": {
+            "slaveId": slave["slaveId"],
+            "accountId": _CORRECT_UNKNOWN_ACCOUNT["accountId"],
+            "amount": slave["amount"],
+            "type": slave["type"],
+            "updated_at": slave["date"],
+        },
     }
 
 
 @pytest.fixture
+def mutable_merged_transaction():
+    """Copie profonde de sample_merged_transaction, modifiable par le test."""
+    return copy.deepcopy(_SAMPLE_MERGED_TRANSACTION)
+
+
+@pytest.fixture(scope="session")
 def mock_supabase_response():
-    """Helper pour créer des réponses Supabase mockées."""
+    """Helper pour créer des réponses Supabase mockées (sans état, partagé)."""
 
     def _create_response(data, count=None):
         """Crée un objet de réponse Supabase mocké.
@@ -194,11 +475,10 @@ def mock_supabase_response():
             count: Nombre optionnel de résultats
 
         Returns:
-            SimpleNamespace avec .data et optionnellement .count
+            FakeResponse avec .data et .count
         """
-        response = SimpleNamespace(data=data)
-        if count is not None:
-            response.count = count
-        return response
+        if count is None and data == []:
+            return _EMPTY_RESPONSE
+        return FakeResponse(data, count)
 
     return _create_response
@@ -7,7 +7,6 @@ import pytest
 from pydantic import ValidationError
 
 from ploutos.db.models import (
-    Account,
     TransactionSlaveWithAccount,
     TransactionWithSlaves,
 )
@@ -47,7 +46,7 @@ def valid_loan_config():
 
 
 @pytest.fixture
-def loan_transaction(correct_unknown_account, sample_accounts):
+def loan_transaction(unknown_account_obj, sample_accounts):
     """Transaction representing a loan payment.
 
     - Type: debit (money leaving account)
@@ -56,23 +55,7 @@ def loan_transaction(correct_unknown_account, sample_accounts):
     - Has 1 slave to Unknown account
     """
     account_id = UUID(sample_accounts[0]["accountId"])
-    unknown_account_id = UUID(correct_unknown_account["accountId"])
-
-    unknown_account_obj = Account(
-        accountId=unknown_account_id,
-        name=correct_unknown_account["name"],
-        category=correct_unknown_account["category"],
-        sub_category=correct_unknown_account["sub_category"],
-        is_real=correct_unknown_account["is_real"],
-        original_amount=correct_unknown_account["original_amount"],
-        active=correct_unknown_account["active"],
-        created_at=datetime.fromisoformat(
-            correct_unknown_account["created_at"].replace("Z", "+00:00")
-        ),
-        updated_at=datetime.fromisoformat(
-            correct_unknown_account["updated_at"].replace("Z", "+00:00")
-        ),
-    )
+    unknown_account_id = unknown_account_obj.accountId
 
     master_id = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
 
@@ -322,7 +305,7 @@ def test_loan_processor_config_class():
 
 
 def test_loan_processor_successful_processing(
-    loan_processor, valid_loan_config, correct_unknown_account, sample_accounts
+    loan_processor, valid_loan_config, unknown_account_obj, sample_accounts
 ):
     """Successful loan processing should return 2 slaves (principal + interest) when amount matches."""
     # Create transaction with exact expected amount for payment #2
@@ -335,22 +318,7 @@ def test_loan_processor_successful_processing(
     )
 
     account_id = UUID(sample_accounts[0]["accountId"])
-    unknown_account_id = UUID(correct_unknown_account["accountId"])
-    unknown_account_obj = Account(
-        accountId=unknown_account_id,
-        name=correct_unknown_account["name"],
-        category=correct_unknown_account["category"],
-        sub_category=correct_unknown_account["sub_category"],
-        is_real=correct_unknown_account["is_real"],
-        original_amount=correct_unknown_account["original_amount"],
-        active=correct_unknown_account["active"],
-        created_at=datetime.fromisoformat(
-            correct_unknown_account["created_at"].replace("Z", "+00:00")
-        ),
-        updated_at=datetime.fromisoformat(
-            correct_unknown_account["updated_at"].replace("Z", "+00:00")
-        ),
-    )
+    unknown_account_id = unknown_account_obj.accountId
     master_id = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
 
     transaction = TransactionWithSlaves(
@@ -7,6 +7,7 @@ qui effectue 3 validations critiques :
 3. Balance : formule master_amount = -(slave_credit - slave_debit)
 """
 
+from contextlib import nullcontext
 from datetime import datetime
 from typing import List
 from uuid import UUID
@@ -22,17 +23,30 @@ from ploutos.db.models import (
 from ploutos.processors.base import ProcessorConfigBase, TransactionProcessor
 
 
+# =============================================================================
+# Constantes
+# =============================================================================
+
+_ACCOUNT_ID = UUID("11111111-1111-1111-1111-111111111111")
+_UNKNOWN_ACCOUNT_ID = UUID("99999999-9999-9999-9999-999999999999")
+_MASTER_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+_TRANSACTION_DATE = datetime(2025, 1, 15)
+_CREDIT_ACCOUNT_ID = UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
+_DEBIT_ACCOUNT_ID = UUID("dddddddd-dddd-dddd-dddd-dddddddddddd")
+_SLAVE_UUID_BASE = UUID("bbbbbbbb-bbbb-bbbb-bbbb-000000000000").int
+
+
 # =============================================================================
 # Fixtures Locales
 # =============================================================================
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_processor():
     """Processeur concret pour tester la méthode de la classe de base.
 
     TransactionProcessor est une classe abstraite, donc on crée une
-    implémentation minimale pour les tests.
+    implémentation minimale pour les tests. Sans état : partagé par le module.
     """
 
     class TestProcessor(TransactionProcessor):
@@ -52,70 +66,52 @@ def mock_processor():
     return TestProcessor()
 
 
-@pytest.fixture
-def base_transaction(sample_accounts, correct_unknown_account):
-    """Transaction de référence avec exactement 1 slave vers Unknown.
+@pytest.fixture(scope="module")
+def base_transaction_template(unknown_account_obj):
+    """Transaction de référence, construite une seule fois par module.
 
-    Type: debit (sortie d'argent)
-    Montant: 100.0
-    Slave: pointe vers correct_unknown_account
+    Même master que sample_accounts[0], slave vers correct_unknown_account.
+    Ne pas modifier : utiliser base_transaction.
     """
-    account_id = (
-        UUID(sample_accounts[0]["accountId"])
-        if isinstance(sample_accounts[0]["accountId"], str)
-        else sample_accounts[0]["accountId"]
-    )
-
-    unknown_account_id = (
-        UUID(correct_unknown_account["accountId"])
-        if isinstance(correct_unknown_account["accountId"], str)
-        else correct_unknown_account["accountId"]
-    )
-
-    # Créer l'objet Account pour le slave
-    unknown_account_obj = Account(
-        accountId=unknown_account_id,
-        name=correct_unknown_account["name"],
-        category=correct_unknown_account["category"],
-        sub_category=correct_unknown_account["sub_category"],
-        is_real=correct_unknown_account["is_real"],
-        original_amount=correct_unknown_account["original_amount"],
-        active=correct_unknown_account["active"],
-        created_at=datetime.fromisoformat(
-            correct_unknown_account["created_at"].replace("Z", "+00:00")
-        ),
-        updated_at=datetime.fromisoformat(
-            correct_unknown_account["updated_at"].replace("Z", "+00:00")
-        ),
-    )
-
-    master_id = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
-
     return TransactionWithSlaves(
-        transactionId=master_id,
+        transactionId=_MASTER_ID,
         description="Test transaction",
-        date=datetime(2025, 1, 15),
+        date=_TRANSACTION_DATE,
         type="debit",
         amount=100.0,
-        accountId=account_id,
-        created_at=datetime(2025, 1, 15),
-        updated_at=datetime(2025, 1, 15),
+        accountId=_ACCOUNT_ID,
+        created_at=_TRANSACTION_DATE,
+        updated_at=_TRANSACTION_DATE,
         TransactionsSlaves=[
             TransactionSlaveWithAccount(
                 slaveId=UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"),
                 type="credit",
                 amount=100.0,
-                date=datetime(2025, 1, 15),
-                accountId=unknown_account_id,
-                masterId=master_id,
-                created_at=datetime(2025, 1, 15),
-                updated_at=datetime(2025, 1, 15),
+                date=_TRANSACTION_DATE,
+                accountId=_UNKNOWN_ACCOUNT_ID,
+                masterId=_MASTER_ID,
+                created_at=_TRANSACTION_DATE,
+                updated_at=_TRANSACTION_DATE,
                 Accounts=unknown_account_obj,
             )
         ],
     )
 
 
+@pytest.fixture
+def base_transaction(base_transaction_template):
+    """Transaction de référence avec exactement 1 slave vers Unknown.
+
+    Type: debit (sortie d'argent)
+    Montant: 100.0
+    Slave: pointe vers correct_unknown_account
+
+    Copie profonde du template : les tests peuvent modifier type/amount
+    et les slaves librement.
+    """
+    return base_transaction_template.model_copy(deep=True)
+
+
 @pytest.fixture
 def make_transaction_slave():
     """Factory fixture pour créer des TransactionSlaveCreate.
@@ -128,14 +124,14 @@ def make_transaction_slave():
         type: str, amount: float, account_id: UUID = None
     ) -> TransactionSlaveCreate:
         if account_id is None:
-            account_id = UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
+            account_id = _CREDIT_ACCOUNT_ID
 
         return TransactionSlaveCreate(
             type=type,
             amount=amount,
-            date=datetime(2025, 1, 15),
+            date=_TRANSACTION_DATE,
             accountId=account_id,
-            masterId=UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+            masterId=_MASTER_ID,
         )
 
     return _create
@@ -162,38 +158,42 @@ def create_transaction_with_slaves(
 
     Returns:
         TransactionWithSlaves avec len(slave_accounts) slaves
+
+    Note:
+        Construit via model_construct (sans validation Pydantic) : les
+        valeurs passées sont déjà typées.
     """
     if account_id is None:
-        account_id = UUID("11111111-1111-1111-1111-111111111111")
-
-    master_id = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
-
-    slaves = []
-    for i, acc in enumerate(slave_accounts):
-        slave_type = "credit" if tx_type == "debit" else "debit"
-        slaves.append(
-            TransactionSlaveWithAccount(
-                slaveId=UUID(f"bbbbbbbb-bbbb-bbbb-bbbb-{i:012d}"),
-                type=slave_type,
-                amount=tx_amount / len(slave_accounts),
-                date=datetime(2025, 1, 15),
-                accountId=acc.accountId,
-                masterId=master_id,
-                created_at=datetime(2025, 1, 15),
-                updated_at=datetime(2025, 1, 15),
-                Accounts=acc,
-            )
+        account_id = _ACCOUNT_ID
+
+    # Invariants de boucle (0 slave : aucun montant à répartir)
+    slave_type = "credit" if tx_type == "debit" else "debit"
+    per_slave_amount = tx_amount / len(slave_accounts) if slave_accounts else 0.0
+
+    slaves = [
+        TransactionSlaveWithAccount.model_construct(
+            slaveId=UUID(int=_SLAVE_UUID_BASE + i),
+            type=slave_type,
+            amount=per_slave_amount,
+            date=_TRANSACTION_DATE,
+            accountId=acc.accountId,
+            masterId=_MASTER_ID,
+            created_at=_TRANSACTION_DATE,
+            updated_at=_TRANSACTION_DATE,
+            Accounts=acc,
         )
+        for i, acc in enumerate(slave_accounts)
+    ]
 
-    return TransactionWithSlaves(
-        transactionId=master_id,
+    return TransactionWithSlaves.model_construct(
+        transactionId=_MASTER_ID,
         description="Test transaction",
-        date=datetime(2025, 1, 15),
+        date=_TRANSACTION_DATE,
         type=tx_type,
         amount=tx_amount,
         accountId=account_id,
-        created_at=datetime(2025, 1, 15),
-        updated_at=datetime(2025, 1, 15),
+        created_at=_TRANSACTION_DATE,
+        updated_at=_TRANSACTION_DATE,
         TransactionsSlaves=slaves,
     )
 
@@ -224,44 +224,29 @@ def create_balanced_slaves(
         Master debit 100 → slaves credit 100, debit 0
         Master credit 100 → slaves credit 0, debit 100
     """
-    slaves = []
-
-    # Si pas spécifié, utiliser des valeurs par défaut équilibrées
+    # Si pas spécifié, utiliser des valeurs par défaut équilibrées :
+    # debit master → signed_master = -M → credit - debit = M
+    # credit master → signed_master = M → credit - debit = -M
     if credit_amount is None and debit_amount is None:
-        if master_type == "debit":
-            # debit master → signed_master = -100
-            # besoin: -(credit - debit) = -100 → credit - debit = 100
-            credit_amount = master_amount
-            debit_amount = 0
-        else:  # credit
-            # credit master → signed_master = 100
-            # besoin: -(credit - debit) = 100 → credit - debit = -100
-            credit_amount = 0
-            debit_amount = master_amount
-
-    if credit_amount > 0:
-        slaves.append(
-            TransactionSlaveCreate(
-                type="credit",
-                amount=credit_amount,
-                date=datetime(2025, 1, 15),
-                accountId=UUID("cccccccc-cccc-cccc-cccc-cccccccccccc"),
-                masterId=master_id,
-            )
+        credit_amount, debit_amount = {
+            "debit": (master_amount, 0),
+            "credit": (0, master_amount),
+        }[master_type]
+
+    return [
+        TransactionSlaveCreate.model_construct(
+            type=slave_type,
+            amount=amount,
+            date=_TRANSACTION_DATE,
+            accountId=account_id,
+            masterId=master_id,
         )
-
-    if debit_amount > 0:
-        slaves.append(
-            TransactionSlaveCreate(
-                type="debit",
-                amount=debit_amount,
-                date=datetime(2025, 1, 15),
-                accountId=UUID("dddddddd-dddd-dddd-dddd-dddddddddddd"),
-                masterId=master_id,
-            )
+        for slave_type, amount, account_id in (
+            ("credit", credit_amount, _CREDIT_ACCOUNT_ID),
+            ("debit", debit_amount, _DEBIT_ACCOUNT_ID),
         )
-
-    return slaves
+        if amount > 0
+    ]
 
 
 # =============================================================================
@@ -290,33 +275,10 @@ def test_validate_transaction_with_exactly_one_slave(
     ],
 )
 def test_validate_transaction_invalid_slave_counts(
-    num_slaves, expected_error, mock_processor, correct_unknown_account, sample_accounts
+    num_slaves, expected_error, mock_processor, unknown_account_obj
 ):
     """Transaction avec != 1 slave doit échouer avec le bon message."""
-    # Arrange: Créer un compte Unknown valide
-    unknown_account_id = (
-        UUID(correct_unknown_account["accountId"])
-        if isinstance(correct_unknown_account["accountId"], str)
-        else correct_unknown_account["accountId"]
-    )
-
-    unknown_account_obj = Account(
-        accountId=unknown_account_id,
-        name=correct_unknown_account["name"],
-        category=correct_unknown_account["category"],
-        sub_category=correct_unknown_account["sub_category"],
-        is_real=correct_unknown_account["is_real"],
-        original_amount=correct_unknown_account["original_amount"],
-        active=correct_unknown_account["active"],
-        created_at=datetime.fromisoformat(
-            correct_unknown_account["created_at"].replace("Z", "+00:00")
-        ),
-        updated_at=datetime.fromisoformat(
-            correct_unknown_account["updated_at"].replace("Z", "+00:00")
-        ),
-    )
-
-    # Créer une transaction avec N slaves
+    # Arrange: Créer une transaction avec N slaves vers un compte Unknown valide
     accounts_for_slaves = [unknown_account_obj] * num_slaves
     transaction = create_transaction_with_slaves(
         tx_type="debit", tx_amount=100.0, slave_accounts=accounts_for_slaves
@@ -360,12 +322,12 @@ def test_validate_transaction_with_correct_unknown_account(
     ],
 )
 def test_validate_transaction_invalid_unknown_account_fields(
-    name, category, sub_category, is_real, mock_processor, sample_accounts
+    name, category, sub_category, is_real, mock_processor
 ):
     """Slave avec n'importe quel champ incorrect doit échouer."""
     # Arrange: Créer un compte avec les champs spécifiés
-    invalid_account = Account(
-        accountId=UUID("99999999-9999-9999-9999-999999999999"),
+    invalid_account = Account.model_construct(
+        accountId=_UNKNOWN_ACCOUNT_ID,
         name=name,
         category=category,
         sub_category=sub_category,
@@ -391,71 +353,81 @@ def test_validate_transaction_invalid_unknown_account_fields(
         mock_processor._validate_transaction(transaction, new_slaves)
 
 
-def test_validate_transaction_with_real_bank_account(
-    mock_processor, sample_accounts, make_transaction_slave
-):
-    """Slave pointant vers un compte bancaire réel doit échouer."""
-    # Arrange: Créer un compte bancaire réel
-    real_account = Account(
-        accountId=UUID(sample_accounts[0]["accountId"]),
-        name=sample_accounts[0]["name"],
-        category=sample_accounts[0]["category"],
-        sub_category=sample_accounts[0]["sub_category"],
-        is_real=sample_accounts[0]["is_real"],
-        original_amount=sample_accounts[0]["original_amount"],
-        active=sample_accounts[0]["active"],
-        created_at=datetime.fromisoformat(
-            sample_accounts[0]["created_at"].replace("Z", "+00:00")
-        ),
-        updated_at=datetime.fromisoformat(
-            sample_accounts[0]["updated_at"].replace("Z", "+00:00")
-        ),
-    )
-
+@pytest.fixture
+def real_account_transaction(real_bank_account):
+    """Transaction dont le slave pointe vers un compte réel, slaves équilibrés."""
     transaction = create_transaction_with_slaves(
-        tx_type="debit", tx_amount=100.0, slave_accounts=[real_account]
+        tx_type="debit", tx_amount=100.0, slave_accounts=[real_bank_account]
     )
-
     new_slaves = create_balanced_slaves(
         master_type="debit",
         master_amount=100.0,
         master_id=transaction.transactionId,
     )
+    return transaction, new_slaves
+
 
-    # Act & Assert: Doit lever ValueError mentionnant le nom du compte réel
-    with pytest.raises(ValueError, match="Banque A"):
+@pytest.mark.parametrize(
+    "expected_match",
+    [
+        # Le message mentionne le nom du compte réel
+        pytest.param("Banque A", id="names_real_account"),
+        # Balance correcte : on échoue sur Unknown avant la balance
+        pytest.param("not Unknown", id="unknown_checked_before_balance"),
+    ],
+)
+def test_validate_transaction_with_real_bank_account(
+    expected_match, mock_processor, real_account_transaction
+):
+    """Slave pointant vers un compte bancaire réel doit échouer."""
+    transaction, new_slaves = real_account_transaction
+
+    # Act & Assert: Doit lever ValueError sur Unknown account, pas la balance
+    with pytest.raises(ValueError, match=expected_match):
         mock_processor._validate_transaction(transaction, new_slaves)
 
 
 # =============================================================================
-# Check 3: Balance Validation - Cas Valides
+# Check 3: Balance Validation
 # =============================================================================
 
 
+# (master_type, master_amount, credit_total, debit_total, should_pass)
+BALANCE_CASES = [
+    # Cas valides
+    pytest.param("debit", 100, 150, 50, True, id="debit_mixed"),  # -(150-50) = -100
+    pytest.param("credit", 100, 50, 150, True, id="credit_mixed"),  # -(50-150) = 100
+    pytest.param("debit", 100, 100, 0, True, id="credit_only"),
+    pytest.param("credit", 100, 0, 100, True, id="debit_only"),
+    pytest.param("debit", 200.50, 250.50, 50, True, id="decimals"),
+    # Précision à 2 décimales (pas de tolérance sous le centime)
+    pytest.param("debit", 100.00, 100.00, 0, True, id="exact_match"),
+    pytest.param("debit", 100.00, 100.01, 0, False, id="one_cent_off"),
+    pytest.param("debit", 100.00, 100.02, 0, False, id="exceeds_tolerance"),
+    # Cas invalides
+    pytest.param("debit", 100, 150, 0, False, id="unbalanced_credit_only"),
+    pytest.param("credit", 100, 100, 0, False, id="wrong_sign_combo"),
+    pytest.param("debit", 100, 50, 50, False, id="zero_net_slaves"),
+]
+
+
 @pytest.mark.parametrize(
-    "master_type,master_amount,credit_total,debit_total",
-    [
-        ("debit", 100, 150, 50),  # debit 100 = -(150-50) = -100
-        ("credit", 100, 50, 150),  # credit 100 = -(50-150) = 100
-        ("debit", 100, 100, 0),  # seulement credits
-        ("credit", 100, 0, 100),  # seulement debits
-        ("debit", 200.50, 250.50, 50),  # avec décimales
-    ],
+    "master_type,master_amount,credit_total,debit_total,should_pass", BALANCE_CASES
 )
-def test_validate_balance_valid_combinations(
+def test_validate_balance_combinations(
     master_type,
     master_amount,
     credit_total,
     debit_total,
+    should_pass,
     mock_processor,
     base_transaction,
 ):
-    """Combinaisons de balance valides doivent passer."""
+    """Balance validée au centime près : master = -(credit - debit)."""
     # Arrange: Modifier le type et montant du master
     base_transaction.type = master_type
     base_transaction.amount = master_amount
 
-    # Créer les slaves équilibrés
     new_slaves = create_balanced_slaves(
         master_type=master_type,
         master_amount=master_amount,
@@ -464,8 +436,15 @@ def test_validate_balance_valid_combinations(
         debit_amount=debit_total,
     )
 
-    # Act & Assert: La validation ne doit pas lever d'exception
-    mock_processor._validate_transaction(base_transaction, new_slaves)
+    expectation = (
+        nullcontext()
+        if should_pass
+        else pytest.raises(ValueError, match="Balance mismatch")
+    )
+
+    # Act & Assert
+    with expectation:
+        mock_processor._validate_transaction(base_transaction, new_slaves)
 
 
 def test_validate_balance_multiple_slaves_balanced(
@@ -487,81 +466,11 @@ def test_validate_balance_multiple_slaves_balanced(
     mock_processor._validate_transaction(base_transaction, new_slaves)
 
 
-@pytest.mark.parametrize(
-    "master_amount,slave_amount,should_pass",
-    [
-        (100.00, 100.00, True),  # exact match
-        (100.00, 100.01, False),  # 1 centime de différence
-        (100.00, 100.02, False),  # 2 centimes de différence
-    ],
-)
-def test_validate_balance_floating_point_tolerance(
-    master_amount, slave_amount, should_pass, mock_processor, base_transaction
-):
-    """Balance validation with 2-decimal precision (no sub-cent tolerance)."""
-    # Arrange: Master debit avec montant spécifié
-    base_transaction.type = "debit"
-    base_transaction.amount = master_amount
-
-    # Slaves: credit avec montant spécifié, debit 0
-    new_slaves = create_balanced_slaves(
-        master_type="debit",
-        master_amount=master_amount,
-        master_id=base_transaction.transactionId,
-        credit_amount=slave_amount,
-        debit_amount=0,
-    )
-
-    # Act & Assert
-    if should_pass:
-        mock_processor._validate_transaction(base_transaction, new_slaves)
-    else:
-        with pytest.raises(ValueError, match="Balance mismatch"):
-            mock_processor._validate_transaction(base_transaction, new_slaves)
-
-
 # =============================================================================
 # Check 3: Balance Validation - Cas Invalides
 # =============================================================================
 
 
-@pytest.mark.parametrize(
-    "master_type,master_amount,credit_total,debit_total,description",
-    [
-        ("debit", 100, 150, 0, "unbalanced_credit_only"),
-        ("credit", 100, 100, 0, "wrong_sign_combo"),
-        ("debit", 100, 50, 50, "zero_net_slaves"),
-        ("debit", 100.00, 100.02, 0, "exceeds_tolerance"),
-    ],
-)
-def test_validate_balance_invalid_combinations(
-    master_type,
-    master_amount,
-    credit_total,
-    debit_total,
-    description,
-    mock_processor,
-    base_transaction,
-):
-    """Combinaisons de balance invalides doivent échouer."""
-    # Arrange: Modifier le type et montant du master
-    base_transaction.type = master_type
-    base_transaction.amount = master_amount
-
-    # Créer les slaves déséquilibrés
-    new_slaves = create_balanced_slaves(
-        master_type=master_type,
-        master_amount=master_amount,
-        master_id=base_transaction.transactionId,
-        credit_amount=credit_total,
-        debit_amount=debit_total,
-    )
-
-    # Act & Assert: Doit lever ValueError avec message de balance
-    with pytest.raises(ValueError, match="Balance mismatch"):
-        mock_processor._validate_transaction(base_transaction, new_slaves)
-
-
 def test_validate_balance_empty_new_slaves(mock_processor, base_transaction):
     """Liste vide de new_slaves doit échouer la validation de balance."""
     # Arrange: Master avec montant, mais aucun nouveau slave
@@ -609,40 +518,3 @@ def test_validate_transaction_fails_on_first_check_ignores_others(
     # Act & Assert: Doit lever ValueError sur le nombre de slaves, pas la balance
     with pytest.raises(ValueError, match="0 slaves"):
         mock_processor._validate_transaction(transaction, new_slaves)
-
-
-def test_validate_transaction_fails_on_second_check_ignores_balance(
-    mock_processor, sample_accounts, make_transaction_slave
-):
-    """Validation doit vérifier Unknown account avant la balance."""
-    # Arrange: Transaction avec 1 slave vers compte réel (pas Unknown)
-    real_account = Account(
-        accountId=UUID(sample_accounts[0]["accountId"]),
-        name=sample_accounts[0]["name"],
-        category=sample_accounts[0]["category"],
-        sub_category=sample_accounts[0]["sub_category"],
-        is_real=sample_accounts[0]["is_real"],
-        original_amount=sample_accounts[0]["original_amount"],
-        active=sample_accounts[0]["active"],
-        created_at=datetime.fromisoformat(
-            sample_accounts[0]["created_at"].replace("Z", "+00:00")
-        ),
-        updated_at=datetime.fromisoformat(
-            sample_accounts[0]["updated_at"].replace("Z", "+00:00")
-        ),
-    )
-
-    transaction = create_transaction_with_slaves(
-        tx_type="debit", tx_amount=100.0, slave_accounts=[real_account]
-    )
-
-    # Balance correcte (mais peu importe, on échoue avant)
-    new_slaves = create_balanced_slaves(
-        master_type="debit",
-        master_amount=100.0,
-        master_id=transaction.transactionId,
-    )
-
-    # Act & Assert: Doit lever ValueError sur Unknown account, pas la balance
-    with pytest.raises(ValueError, match="not Unknown"):
-        mock_processor._validate_transaction(transaction, new_slaves)
@@ -11,7 +11,6 @@ import pytest
 from pydantic import ValidationError
 
 from ploutos.db.models import (
-    Account,
     TransactionSlaveCreate,
     TransactionSlaveWithAccount,
     TransactionWithSlaves,
@@ -35,7 +34,7 @@ def simple_split_processor():
 
 
 @pytest.fixture
-def base_split_transaction(correct_unknown_account):
+def base_split_transaction(unknown_account_obj):
     """Base transaction ready for splitting.
 
     Creates a debit transaction of 100.0 with exactly 1 slave pointing to
@@ -45,34 +44,17 @@ def base_split_transaction(correct_unknown_account):
     slave_id = UUID("bbbbbbbb-1111-2222-3333-444444444444")
     test_date = datetime(2025, 6, 15, 14, 30, 0)
 
-    # Create Unknown account
-    unknown_account = Account(
-        accountId=UUID(correct_unknown_account["accountId"]),
-        name=correct_unknown_account["name"],
-        category=correct_unknown_account["category"],
-        sub_category=correct_unknown_account["sub_category"],
-        is_real=correct_unknown_account["is_real"],
-        original_amount=correct_unknown_account["original_amount"],
-        active=correct_unknown_account["active"],
-        created_at=datetime.fromisoformat(
-            correct_unknown_account["created_at"].replace("Z", "+00:00")
-        ),
-        updated_at=datetime.fromisoformat(
-            correct_unknown_account["updated_at"].replace("Z", "+00:00")
-        ),
-    )
-
     # Create slave pointing to Unknown
     slave = TransactionSlaveWithAccount(
         slaveId=slave_id,
         type="credit",
         amount=100.0,
         date=test_date,
-        accountId=unknown_account.accountId,
+        accountId=unknown_account_obj.accountId,
         masterId=master_id,
         created_at=test_date,
         updated_at=test_date,
-        Accounts=unknown_account,
+        Accounts=unknown_account_obj,
     )
 
     # Create master transaction
@@ -82,7 +64,7 @@ def base_split_transaction(correct_unknown_account):
         amount=100.0,
         date=test_date,
         description="Test transaction",
-        accountId=unknown_account.accountId,
+        accountId=unknown_account_obj.accountId,
         created_at=test_date,
         updated_at=test_date,
         TransactionsSlaves=[slave],
@@ -759,7 +741,7 @@ def test_process_fails_validation_multiple_slaves(
     base_split_transaction,
     make_split_config,
     two_account_ids,
-    correct_unknown_account,
+    unknown_account_obj,
 ):
     """Transaction with multiple slaves should fail validation."""
     # Arrange: Add extra slave to base transaction
@@ -768,25 +750,11 @@ def test_process_fails_validation_multiple_slaves(
         type="credit",
         amount=50.0,
         date=base_split_transaction.date,
-        accountId=UUID(correct_unknown_account["accountId"]),
+        accountId=unknown_account_obj.accountId,
         masterId=base_split_transaction.transactionId,
         created_at=datetime.now(),
         updated_at=datetime.now(),
-        Accounts=Account(
-            accountId=UUID(correct_unknown_account["accountId"]),
-            name=correct_unknown_account["name"],
-            category=correct_unknown_account["category"],
-            sub_category=correct_unknown_account["sub_category"],
-            is_real=correct_unknown_account["is_real"],
-            original_amount=correct_unknown_account["original_amount"],
-            active=correct_unknown_account["active"],
-            created_at=datetime.fromisoformat(
-                correct_unknown_account["created_at"].replace("Z", "+00:00")
-            ),
-            updated_at=datetime.fromisoformat(
-                correct_unknown_account["updated_at"].replace("Z", "+00:00")
-            ),
-        ),
+        Accounts=unknown_account_obj,
     )
     base_split_transaction.TransactionsSlaves.append(extra_slave)
 
@@ -823,26 +791,11 @@ def test_process_fails_validation_real_account_slave(
     base_split_transaction,
     make_split_config,
     two_account_ids,
-    sample_accounts,
+    real_bank_account,
 ):
     """Transaction with slave to real account should fail validation."""
     # Arrange: Replace slave's account with real bank account
-    real_account = Account(
-        accountId=UUID(sample_accounts[0]["accountId"]),
-        name=sample_accounts[0]["name"],
-        category=sample_accounts[0]["category"],
-        sub_category=sample_accounts[0]["sub_category"],
-        is_real=True,
-        original_amount=sample_accounts[0]["original_amount"],
-        active=sample_accounts[0]["active"],
-        created_at=datetime.fromisoformat(
-            sample_accounts[0]["created_at"].replace("Z", "+00:00")
-        ),
-        updated_at=datetime.fromisoformat(
-            sample_accounts[0]["updated_at"].replace("Z", "+00:00")
-        ),
-    )
-    base_split_transaction.TransactionsSlaves[0].Accounts = real_account
+    base_split_transaction.TransactionsSlaves[0].Accounts = real_bank_account
 
     config = make_split_config([{"account_id": two_account_ids[0], "percentage": 100}])
 
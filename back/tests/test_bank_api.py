@@ -0,0 +1,258 @@
+"""Tests pour la connexion aux comptes GoCardless (bank_api)."""
+
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import ploutos.api.bank_api as bank_api
+
+ACCOUNT_ID = "11111111-1111-1111-1111-111111111111"
+
+
+class FakeAccountApi:
+    """AccountApi factice : métadonnées READY, appels comptés."""
+
+    def __init__(self, secret):
+        self.secret = secret
+        self.metadata_calls = 0
+
+    def get_metadata(self):
+        self.metadata_calls += 1
+        return {"status": "READY"}
+
+    def get_details(self):
+        return {}
+
+
+class FakeNordigenClient:
+    """NordigenClient factice : tokens et comptes créés sans réseau."""
+
+    def __init__(self, access_expires=3600):
+        self.access_expires = access_expires
+        self.token_calls = 0
+        self.accounts = []
+
+    def generate_token(self):
+        self.token_calls += 1
+        return {"access": "token", "access_expires": self.access_expires}
+
+    def account_api(self, id):
+        account = FakeAccountApi(id)
+        self.accounts.append(account)
+        return account
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Horloge monotone contrôlée par le test (secondes)."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(bank_api, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+@pytest.fixture
+def fake_client(monkeypatch, clock):
+    """Client GoCardless factice, sans token ni connexion en cache."""
+    fake = FakeNordigenClient()
+    monkeypatch.setattr(bank_api, "client", fake)
+    monkeypatch.setattr(bank_api, "_token_expires_at", 0.0)
+    monkeypatch.setattr(bank_api, "_connections", {})
+    return fake
+
+
+@pytest.fixture
+def secrets(monkeypatch):
+    """Secrets par accountId, lus par get_secret (modifiables par le test)."""
+    values = {ACCOUNT_ID: ("secret-1", "bank_001")}
+    monkeypatch.setattr(bank_api, "get_secret", lambda account_id: values[account_id])
+    return values
+
+
+@pytest.fixture
+def nordigen_transactions():
+    """Réponse get_transactions au format nordigen (booked + pending)."""
+    return {
+        "booked": [
+            {
+                "transactionId": "b1",
+                "bookingDate": "2025-01-02",
+                "valueDate": "2025-01-02",
+                "transactionAmount": {"amount": "-12.50", "currency": "EUR"},
+                "remittanceInformationUnstructuredArray": ["CB SHOP", "PARIS"],
+            },
+            {
+                "transactionId": "b2",
+                "bookingDate": "2025-01-03",
+                "valueDate": "2025-01-04",
+                "transactionAmount": {"amount": "100", "currency": "EUR"},
+                "remittanceInformationUnstructuredArray": ["VIR SALAIRE"],
+            },
+        ],
+        "pending": [
+            {
+                "transactionId": "p1",
+                "bookingDate": "2025-01-05",
+                "transactionAmount": {"amount": "3.20", "currency": "EUR"},
+                "remittanceInformationUnstructuredArray": ["PRLV"],
+            },
+            {
+                "transactionId": "p2",
+                "bookingDate": "2025-01-06",
+                "transactionAmount": {"amount": "-1", "currency": "EUR"},
+            },
+        ],
+    }
+
+
+# =============================================================================
+# Tests pour _connect_account
+# =============================================================================
+
+
+def test_connect_account_reuses_connection_within_ttl(fake_client, secrets, clock):
+    """Dans le TTL, le compte n'est ni recréé ni revérifié."""
+    first = bank_api._connect_account(ACCOUNT_ID)
+    clock.value += bank_api.METADATA_TTL - 1
+    second = bank_api._connect_account(ACCOUNT_ID)
+
+    assert second == first
+    assert len(fake_client.accounts) == 1
+    assert fake_client.accounts[0].metadata_calls == 1
+
+
+def test_connect_account_reconnects_after_ttl(fake_client, secrets, clock):
+    """Après METADATA_TTL, les métadonnées sont revérifiées."""
+    bank_api._connect_account(ACCOUNT_ID)
+    clock.value += bank_api.METADATA_TTL
+    bank_api._connect_account(ACCOUNT_ID)
+
+    assert len(fake_client.accounts) == 2
+
+
+def test_connect_account_reconnects_when_secret_changes(fake_client, secrets):
+    """Un secret mis à jour (save_secret) donne une nouvelle connexion."""
+    bank_api._connect_account(ACCOUNT_ID)
+    secrets[ACCOUNT_ID] = ("secret-2", "bank_001")
+    api, account_name, metadata = bank_api._connect_account(ACCOUNT_ID)
+
+    assert api.secret == "secret-2"
+    assert [account.secret for account in fake_client.accounts] == [
+        "secret-1",
+        "secret-2",
+    ]
+    assert account_name == "bank_001"
+    assert metadata == {"status": "READY"}
+
+
+# =============================================================================
+# Tests pour ensure_token
+# =============================================================================
+
+
+def test_ensure_token_reuses_valid_token(fake_client):
+    """Un token encore valide n'est pas régénéré."""
+    bank_api.ensure_token()
+    bank_api.ensure_token()
+
+    assert fake_client.token_calls == 1
+
+
+def test_ensure_token_refreshes_at_margin(fake_client, clock):
+    """Le token est régénéré TOKEN_REFRESH_MARGIN secondes avant expiration."""
+    bank_api.ensure_token()
+    refresh_at = fake_client.access_expires - bank_api.TOKEN_REFRESH_MARGIN
+
+    clock.value += refresh_at - 1
+    bank_api.ensure_token()
+    assert fake_client.token_calls == 1
+
+    clock.value += 1
+    bank_api.ensure_token()
+    assert fake_client.token_calls == 2
+
+
+def test_connect_account_refreshes_expired_token(fake_client, secrets, clock):
+    """Une connexion en cache n'empêche pas le renouvellement du token."""
+    bank_api._connect_account(ACCOUNT_ID)
+    clock.value += fake_client.access_expires
+    bank_api._connect_account(ACCOUNT_ID)
+
+    assert fake_client.token_calls == 2
+
+
+# =============================================================================
+# Tests pour transactions_to_df / process
+# =============================================================================
+
+
+def test_transactions_to_df_booked_and_pending(nordigen_transactions):
+    """Booked puis pending, dates de valeur distinctes et description absente."""
+    df = bank_api.transactions_to_df(nordigen_transactions)
+
+    expected = pd.DataFrame(
+        {
+            "transactionId": ["b1", "b2", "p1", "p2"],
+            "Date": pd.to_datetime(
+                ["2025-01-02", "2025-01-03", "2025-01-05", "2025-01-06"]
+            ),
+            "Date valeur": pd.to_datetime(["2025-01-02", "2025-01-04", None, None]),
+            "Montant_dict": [
+                {"amount": "-12.50", "currency": "EUR"},
+                {"amount": "100", "currency": "EUR"},
+                {"amount": "3.20", "currency": "EUR"},
+                {"amount": "-1", "currency": "EUR"},
+            ],
+            "Montant": [-12.5, 100.0, 3.2, -1.0],
+            "Type": ["Booked", "Booked", "Pending", "Pending"],
+        },
+        index=[0, 1, 0, 1],
+    )
+    pd.testing.assert_frame_equal(df.drop(columns="Description"), expected)
+    # p2 n'a pas de remittanceInformationUnstructuredArray
+    assert df["Description"].tolist() == ["CB SHOP, PARIS", "VIR SALAIRE", "PRLV", ""]
+
+
+def test_transactions_to_df_single_kind(nordigen_transactions):
+    """Sans pending, seules les transactions booked sont renvoyées."""
+    nordigen_transactions["pending"] = []
+
+    df = bank_api.transactions_to_df(nordigen_transactions)
+
+    assert df["transactionId"].tolist() == ["b1", "b2"]
+    assert df["Type"].tolist() == ["Booked", "Booked"]
+    assert df.index.tolist() == [0, 1]
+
+
+def test_transactions_to_df_empty():
+    """Aucune transaction : DataFrame vide."""
+    df = bank_api.transactions_to_df({"booked": [], "pending": []})
+
+    assert df.empty
+
+
+def test_process_reuses_booking_date_when_value_dates_match(nordigen_transactions):
+    """Dates de valeur identiques : même colonne que la date de comptabilisation."""
+    booked = nordigen_transactions["booked"]
+    booked[1]["valueDate"] = booked[1]["bookingDate"]
+
+    df = bank_api.process(booked)
+
+    pd.testing.assert_series_equal(df["Date valeur"], df["Date"], check_names=False)
+    assert df["Date"].tolist() == pd.to_datetime(["2025-01-02", "2025-01-03"]).tolist()
+
+
+def test_process_rejects_mixed_currencies(nordigen_transactions):
+    """Une devise autre que EUR lève une ValueError."""
+    booked = nordigen_transactions["booked"]
+    booked[1]["transactionAmount"]["currency"] = "USD"
+
+    with pytest.raises(ValueError, match="Currency USD is not EUR"):
+        bank_api.process(booked)
+
+
+def test_process_missing_description_is_empty(nordigen_transactions):
+    """Sans remittanceInformationUnstructuredArray, la description est vide."""
+    df = bank_api.process(nordigen_transactions["pending"])
+
+    assert df["Description"].tolist() == ["PRLV", ""]
@@ -1,9 +1,10 @@
 """Tests pour le router /budget."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
+from ploutos.api.routers import budget as _budget_router
 from ploutos.api.routers.budget import (
     _calculate_percent,
     _calculate_percent_change,
@@ -16,6 +17,12 @@ from ploutos.api.routers.budget import (
 # =============================================================================
 
 
+@pytest.fixture
+def mock_db(fake_supabase):
+    """Client Supabase factice (remis à zéro par _reset_fake_supabase)."""
+    return fake_supabase
+
+
 @pytest.fixture
 def sample_virtual_accounts():
     """Comptes virtuels pour les tests de budget."""
@@ -143,7 +150,6 @@ def test_get_budgets_by_year_returns_all_virtual_accounts(
     mock_db,
     sample_virtual_accounts,
     sample_budgets,
-    mock_supabase_response,
 ):
     """Retourne tous les comptes virtuels avec leurs budgets."""
     # Arrange
@@ -162,11 +168,7 @@ def test_get_budgets_by_year_returns_all_virtual_accounts(
         },
     ]
 
-    mock_table = MagicMock()
-    mock_table.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.return_value = mock_supabase_response(
-        db_response
-    )
-    mock_db.table.return_value = mock_table
+    mock_db.respond("Accounts", "select", db_response)
 
     # Act
     response = test_client.get("/budget/2025")
@@ -182,9 +184,17 @@ def test_get_budgets_by_year_returns_all_virtual_accounts(
     assert budgets[1]["annual_budget"] == 2400.0
     assert budgets[1]["monthly_budget"] == 200.0  # 2400 / 12
 
+    # Comptes virtuels actifs, budget filtré sur l'année demandée
+    (select,) = mock_db.calls_to("Accounts", "select")
+    assert select.filters == [
+        ("eq", "is_real", False),
+        ("eq", "active", True),
+        ("eq", "Budget.year", 2025),
+    ]
+
 
 def test_get_budgets_by_year_with_null_budget(
-    test_client, mock_db, sample_virtual_accounts, mock_supabase_response
+    test_client, mock_db, sample_virtual_accounts
 ):
     """Retourne null pour les comptes sans budget défini."""
     # Arrange
@@ -197,11 +207,7 @@ def test_get_budgets_by_year_with_null_budget(
         },
     ]
 
-    mock_table = MagicMock()
-    mock_table.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.return_value = mock_supabase_response(
-        db_response
-    )
-    mock_db.table.return_value = mock_table
+    mock_db.respond("Accounts", "select", db_response)
 
     # Act
     response = test_client.get("/budget/2025")
@@ -214,14 +220,10 @@ def test_get_budgets_by_year_with_null_budget(
     assert budgets[0]["monthly_budget"] is None
 
 
-def test_get_budgets_by_year_empty(test_client, mock_db, mock_supabase_response):
+def test_get_budgets_by_year_empty(test_client, mock_db):
     """Retourne une liste vide si aucun compte virtuel."""
     # Arrange
-    mock_table = MagicMock()
-    mock_table.select.return_value.eq.return_value.eq.return_value.eq.return_value.execute.return_value = mock_supabase_response(
-        []
-    )
-    mock_db.table.return_value = mock_table
+    mock_db.respond("Accounts", "select", [])
 
     # Act
     response = test_client.get("/budget/2025")
@@ -237,37 +239,22 @@ def test_get_budgets_by_year_empty(test_client, mock_db, mock_supabase_response)
 
 
 def test_upsert_budget_creates_new_budget(
-    test_client, mock_db, sample_virtual_accounts, mock_supabase_response
+    test_client, mock_db, sample_virtual_accounts
 ):
     """Crée un nouveau budget pour un compte virtuel."""
     # Arrange
     account = sample_virtual_accounts[0]
 
     # Mock pour la vérification du compte
-    mock_table_accounts = MagicMock()
-    mock_table_accounts.select.return_value.eq.return_value.single.return_value.execute.return_value = mock_supabase_response(
-        {"is_real": False}
-    )
+    mock_db.respond("Accounts", "select", {"is_real": False})
 
     # Mock pour l'upsert du budget
-    mock_table_budget = MagicMock()
     upsert_result = {
         "accountId": account["accountId"],
         "year": 2025,
         "annual_budget": 6000.0,
     }
-    mock_table_budget.upsert.return_value.execute.return_value = mock_supabase_response(
-        [upsert_result]
-    )
-
-    def table_router(table_name):
-        if table_name == "Accounts":
-            return mock_table_accounts
-        elif table_name == "Budget":
-            return mock_table_budget
-        return MagicMock()
-
-    mock_db.table.side_effect = table_router
+    mock_db.respond("Budget", "upsert", [upsert_result])
 
     # Act
     response = test_client.put(
@@ -285,37 +272,30 @@ def test_upsert_budget_creates_new_budget(
     assert result["accountId"] == account["accountId"]
     assert result["annual_budget"] == 6000.0
 
+    # Compte vérifié par son ID, budget envoyé pour (compte, année)
+    (select,) = mock_db.calls_to("Accounts", "select")
+    assert select.filters == [("eq", "accountId", account["accountId"]), ("single",)]
+    (upsert,) = mock_db.calls_to("Budget", "upsert")
+    assert upsert.payload["accountId"] == account["accountId"]
+    assert upsert.payload["year"] == 2025
+    assert upsert.payload["annual_budget"] == 6000.0
+
 
 def test_upsert_budget_updates_existing_budget(
-    test_client, mock_db, sample_virtual_accounts, mock_supabase_response
+    test_client, mock_db, sample_virtual_accounts
 ):
     """Met à jour un budget existant."""
     # Arrange
     account = sample_virtual_accounts[0]
 
-    mock_table_accounts = MagicMock()
-    mock_table_accounts.select.return_value.eq.return_value.single.return_value.execute.return_value = mock_supabase_response(
-        {"is_real": False}
-    )
+    mock_db.respond("Accounts", "select", {"is_real": False})
 
-    mock_table_budget = MagicMock()
     upsert_result = {
         "accountId": account["accountId"],
         "year": 2025,
         "annual_budget": 7200.0,  # Nouveau montant
     }
-    mock_table_budget.upsert.return_value.execute.return_value = mock_supabase_response(
-        [upsert_result]
-    )
-
-    def table_router(table_name):
-        if table_name == "Accounts":
-            return mock_table_accounts
-        elif table_name == "Budget":
-            return mock_table_budget
-        return MagicMock()
-
-    mock_db.table.side_effect = table_router
+    mock_db.respond("Budget", "upsert", [upsert_result])
 
     # Act
     response = test_client.put(
@@ -333,17 +313,10 @@ def test_upsert_budget_updates_existing_budget(
     assert result["annual_budget"] == 7200.0
 
 
-def test_upsert_budget_rejects_real_account(
-    test_client, mock_db, sample_real_account, mock_supabase_response
-):
+def test_upsert_budget_rejects_real_account(test_client, mock_db, sample_real_account):
     """Rejette la création de budget sur un compte réel."""
     # Arrange
-    mock_table_accounts = MagicMock()
-    mock_table_accounts.select.return_value.eq.return_value.single.return_value.execute.return_value = mock_supabase_response(
-        {"is_real": True}
-    )
-
-    mock_db.table.return_value = mock_table_accounts
+    mock_db.respond("Accounts", "select", {"is_real": True})
 
     # Act
     response = test_client.put(
@@ -360,17 +333,10 @@ def test_upsert_budget_rejects_real_account(
     assert "virtuel" in response.json()["detail"].lower()
 
 
-def test_upsert_budget_rejects_unknown_account(
-    test_client, mock_db, mock_supabase_response
-):
+def test_upsert_budget_rejects_unknown_account(test_client, mock_db):
     """Erreur 404 si le compte n'existe pas."""
     # Arrange
-    mock_table_accounts = MagicMock()
-    mock_table_accounts.select.return_value.eq.return_value.single.return_value.execute.return_value = mock_supabase_response(
-        None
-    )
-
-    mock_db.table.return_value = mock_table_accounts
+    mock_db.respond("Accounts", "select", None)
 
     # Act
     response = test_client.put(
@@ -408,9 +374,7 @@ def test_upsert_budget_rejects_negative_amount(test_client, mock_db):
 # =============================================================================
 
 
-def test_get_budget_consumption_returns_spending_stats(
-    test_client, mock_db, mock_supabase_response
-):
+def test_get_budget_consumption_returns_spending_stats(test_client, mock_db):
     """Retourne les statistiques de consommation du budget."""
     # Arrange
     rpc_data = [
@@ -424,13 +388,11 @@ def test_get_budget_consumption_returns_spending_stats(
         },
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_budget_consumption", "rpc", rpc_data)
 
     # Act
-    with patch(
-        "ploutos.api.routers.budget.calculate_percent_year_elapsed", return_value=50.0
+    with patch.object(
+        _budget_router, "calculate_percent_year_elapsed", return_value=50.0
     ):
         response = test_client.get("/budget/2025/consumption")
 
@@ -452,10 +414,12 @@ def test_get_budget_consumption_returns_spending_stats(
     assert item["percent_ytd"] == 46.7  # 2800 / 6000 * 100
     assert item["percent_year_elapsed"] == 50.0
 
+    (rpc_call,) = mock_db.calls_to("get_budget_consumption", "rpc")
+    assert rpc_call.payload["p_year"] == 2025
+    assert 1 <= rpc_call.payload["p_current_month"] <= 12
 
-def test_get_budget_consumption_position_ahead(
-    test_client, mock_db, mock_supabase_response
-):
+
+def test_get_budget_consumption_position_ahead(test_client, mock_db):
     """Position 'ahead' quand dépenses bien inférieures au temps écoulé."""
     # Arrange
     rpc_data = [
@@ -469,13 +433,11 @@ def test_get_budget_consumption_position_ahead(
         },
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_budget_consumption", "rpc", rpc_data)
 
     # Act
-    with patch(
-        "ploutos.api.routers.budget.calculate_percent_year_elapsed", return_value=50.0
+    with patch.object(
+        _budget_router, "calculate_percent_year_elapsed", return_value=50.0
     ):
         response = test_client.get("/budget/2025/consumption")
 
@@ -484,9 +446,7 @@ def test_get_budget_consumption_position_ahead(
     assert response.json()[0]["position_indicator"] == "ahead"
 
 
-def test_get_budget_consumption_position_behind(
-    test_client, mock_db, mock_supabase_response
-):
+def test_get_budget_consumption_position_behind(test_client, mock_db):
     """Position 'behind' quand dépenses bien supérieures au temps écoulé."""
     # Arrange
     rpc_data = [
@@ -500,13 +460,11 @@ def test_get_budget_consumption_position_behind(
         },
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_budget_consumption", "rpc", rpc_data)
 
     # Act
-    with patch(
-        "ploutos.api.routers.budget.calculate_percent_year_elapsed", return_value=50.0
+    with patch.object(
+        _budget_router, "calculate_percent_year_elapsed", return_value=50.0
     ):
         response = test_client.get("/budget/2025/consumption")
 
@@ -515,9 +473,7 @@ def test_get_budget_consumption_position_behind(
     assert response.json()[0]["position_indicator"] == "behind"
 
 
-def test_get_budget_consumption_position_on_track(
-    test_client, mock_db, mock_supabase_response
-):
+def test_get_budget_consumption_position_on_track(test_client, mock_db):
     """Position 'on_track' quand dépenses dans la tolérance."""
     # Arrange
     rpc_data = [
@@ -531,13 +487,11 @@ def test_get_budget_consumption_position_on_track(
         },
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_budget_consumption", "rpc", rpc_data)
 
     # Act
-    with patch(
-        "ploutos.api.routers.budget.calculate_percent_year_elapsed", return_value=50.0
+    with patch.object(
+        _budget_router, "calculate_percent_year_elapsed", return_value=50.0
     ):
         response = test_client.get("/budget/2025/consumption")
 
@@ -546,9 +500,7 @@ def test_get_budget_consumption_position_on_track(
     assert response.json()[0]["position_indicator"] == "on_track"
 
 
-def test_get_budget_consumption_handles_null_spending(
-    test_client, mock_db, mock_supabase_response
-):
+def test_get_budget_consumption_handles_null_spending(test_client, mock_db):
     """Gère correctement les dépenses nulles (None)."""
     # Arrange
     rpc_data = [
@@ -562,13 +514,11 @@ def test_get_budget_consumption_handles_null_spending(
         },
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_budget_consumption", "rpc", rpc_data)
 
     # Act
-    with patch(
-        "ploutos.api.routers.budget.calculate_percent_year_elapsed", return_value=50.0
+    with patch.object(
+        _budget_router, "calculate_percent_year_elapsed", return_value=50.0
     ):
         response = test_client.get("/budget/2025/consumption")
 
@@ -582,16 +532,14 @@ def test_get_budget_consumption_handles_null_spending(
     assert item["position_indicator"] == "ahead"
 
 
-def test_get_budget_consumption_empty(test_client, mock_db, mock_supabase_response):
+def test_get_budget_consumption_empty(test_client, mock_db):
     """Retourne une liste vide si aucun compte virtuel."""
     # Arrange
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response([])
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_budget_consumption", "rpc", [])
 
     # Act
-    with patch(
-        "ploutos.api.routers.budget.calculate_percent_year_elapsed", return_value=50.0
+    with patch.object(
+        _budget_router, "calculate_percent_year_elapsed", return_value=50.0
     ):
         response = test_client.get("/budget/2025/consumption")
 
@@ -600,9 +548,7 @@ def test_get_budget_consumption_empty(test_client, mock_db, mock_supabase_respon
     assert response.json() == []
 
 
-def test_get_budget_consumption_without_budget(
-    test_client, mock_db, mock_supabase_response
-):
+def test_get_budget_consumption_without_budget(test_client, mock_db):
     """Retourne les comptes sans budget avec annual_budget null."""
     # Arrange
     rpc_data = [
@@ -616,13 +562,11 @@ def test_get_budget_consumption_without_budget(
         },
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_budget_consumption", "rpc", rpc_data)
 
     # Act
-    with patch(
-        "ploutos.api.routers.budget.calculate_percent_year_elapsed", return_value=50.0
+    with patch.object(
+        _budget_router, "calculate_percent_year_elapsed", return_value=50.0
     ):
         response = test_client.get("/budget/2025/consumption")
 
@@ -678,9 +622,7 @@ class TestCalculatePercentChange:
 # =============================================================================
 
 
-def test_get_budget_comparison_returns_comparison(
-    test_client, mock_db, mock_supabase_response
-):
+def test_get_budget_comparison_returns_comparison(test_client, mock_db):
     """Retourne la comparaison des dépenses entre deux années."""
     # Arrange
     rpc_data = [
@@ -700,9 +642,7 @@ def test_get_budget_comparison_returns_comparison(
         },
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_budget_comparison", "rpc", rpc_data)
 
     # Act
     response = test_client.get("/budget-comparison/2025/6")
@@ -723,10 +663,11 @@ def test_get_budget_comparison_returns_comparison(
     assert comparison[1]["difference"] == -50.0
     assert comparison[1]["percent_change"] == -25.0
 
+    (rpc_call,) = mock_db.calls_to("get_budget_comparison", "rpc")
+    assert rpc_call.payload == {"p_year": 2025, "p_month": 6}
 
-def test_get_budget_comparison_with_zero_previous(
-    test_client, mock_db, mock_supabase_response
-):
+
+def test_get_budget_comparison_with_zero_previous(test_client, mock_db):
     """percent_change est null si pas de dépenses l'année précédente."""
     # Arrange
     rpc_data = [
@@ -739,9 +680,7 @@ def test_get_budget_comparison_with_zero_previous(
         },
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_budget_comparison", "rpc", rpc_data)
 
     # Act
     response = test_client.get("/budget-comparison/2025/6")
@@ -753,12 +692,10 @@ def test_get_budget_comparison_with_zero_previous(
     assert comparison[0]["difference"] == 320.0
 
 
-def test_get_budget_comparison_empty(test_client, mock_db, mock_supabase_response):
+def test_get_budget_comparison_empty(test_client, mock_db):
     """Retourne une liste vide si aucune donnée."""
     # Arrange
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response([])
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_budget_comparison", "rpc", [])
 
     # Act
     response = test_client.get("/budget-comparison/2025/6")
@@ -768,9 +705,7 @@ def test_get_budget_comparison_empty(test_client, mock_db, mock_supabase_respons
     assert response.json() == []
 
 
-def test_get_budget_comparison_handles_null_values(
-    test_client, mock_db, mock_supabase_response
-):
+def test_get_budget_comparison_handles_null_values(test_client, mock_db):
     """Gère les valeurs null retournées par la base."""
     # Arrange
     rpc_data = [
@@ -783,9 +718,7 @@ def test_get_budget_comparison_handles_null_values(
         },
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_budget_comparison", "rpc", rpc_data)
 
     # Act
     response = test_client.get("/budget-comparison/2025/6")
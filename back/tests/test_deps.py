@@ -0,0 +1,28 @@
+"""Tests pour la dépendance DB partagée (deps)."""
+
+import inspect
+
+from fastapi.routing import APIRoute
+
+from ploutos.api.deps import get_db_dependency
+from ploutos.api.main import app
+
+
+def _uses_db(dependant):
+    """Vrai si la dépendance (ou une sous-dépendance) est get_db_dependency."""
+    return any(
+        dep.call is get_db_dependency or _uses_db(dep) for dep in dependant.dependencies
+    )
+
+
+def test_db_handlers_are_sync():
+    """Les handlers utilisant SessionDep sont des def, exécutés dans le threadpool."""
+    async_db_routes = [
+        route.path
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and _uses_db(route.dependant)
+        and inspect.iscoroutinefunction(route.endpoint)
+    ]
+
+    assert async_db_routes == []
@@ -6,7 +6,12 @@ from types import SimpleNamespace
 
 from ploutos.services.matching_service import (
     _apply_condition_filter,
+    _apply_regex_filters,
+    _compile_regex,
+    _condition_to_filter,
+    _dedupe_conditions,
     _filter_single_slave,
+    _group_to_filter,
     _match_and_conditions,
     _match_or_conditions,
     find_matching_transactions,
@@ -87,13 +92,24 @@ def mock_db_with_transactions():
             "lt",
             "gte",
             "lte",
-            "range",
+            "or_",
         ]:
             setattr(mock_select, method, MagicMock(return_value=mock_select))
 
         # Configure execute pour retourner les transactions
         mock_select.execute.return_value = SimpleNamespace(data=transactions_list)
 
+        # range() retourne la page demandée, chaque page n'est construite qu'une fois
+        pages = {}
+
+        def _range(start, end):
+            if (start, end) not in pages:
+                page = SimpleNamespace(data=transactions_list[start : end + 1])
+                pages[(start, end)] = SimpleNamespace(execute=lambda: page)
+            return pages[(start, end)]
+
+        mock_select.range = MagicMock(side_effect=_range)
+
         return mock_db
 
     return _create_mock
@@ -243,6 +259,151 @@ class TestApplyConditionFilterEdgeCases:
         mock_query.ilike.assert_called_once_with("description", "%PAIEMENT 50%%")
 
 
+# =============================================================================
+# Tests pour _condition_to_filter / _group_to_filter
+# =============================================================================
+
+
+class TestConditionToFilter:
+    """Tests pour la traduction des conditions en filtres PostgREST."""
+
+    def test_contains_builds_quoted_ilike(self):
+        """CONTAINS doit générer un ilike *value* entre guillemets."""
+        condition = {"match_type": MatchType.CONTAINS.value, "match_value": "AMAZON"}
+
+        assert _condition_to_filter(condition) == 'description.ilike."*AMAZON*"'
+
+    def test_starts_with_builds_quoted_ilike(self):
+        """STARTS_WITH doit générer un ilike value*."""
+        condition = {"match_type": MatchType.STARTS_WITH.value, "match_value": "VIR"}
+
+        assert _condition_to_filter(condition) == 'description.ilike."VIR*"'
+
+    def test_amount_converts_to_float(self):
+        """Les conditions de montant utilisent l'opérateur PostgREST."""
+        condition = {"match_type": MatchType.AMOUNT_GTE.value, "match_value": "20"}
+
+        assert _condition_to_filter(condition) == "amount.gte.20.0"
+
+    def test_reserved_characters_are_escaped(self):
+        """Virgules, parenthèses et guillemets ne cassent pas l'arbre logique."""
+        condition = {
+            "match_type": MatchType.EXACT.value,
+            "match_value": 'CB "FNAC" (PARIS), 12',
+        }
+
+        assert (
+            _condition_to_filter(condition)
+            == 'description.ilike."CB \\"FNAC\\" (PARIS), 12"'
+        )
+
+    def test_regex_returns_none(self):
+        """REGEX ne peut pas être traduit (géré via RPC)."""
+        condition = {"match_type": MatchType.REGEX.value, "match_value": r"\d{4}"}
+
+        assert _condition_to_filter(condition) is None
+
+    def test_unknown_match_type_raises_error(self):
+        """Un type de match inconnu doit lever une erreur."""
+        with pytest.raises(ValueError, match="Unknown match type"):
+            _condition_to_filter({"match_type": "unknown", "match_value": "x"})
+
+    def test_group_combines_conditions_with_operator(self):
+        """Un groupe combine ses conditions avec son opérateur."""
+        conditions = [
+            {"match_type": MatchType.CONTAINS.value, "match_value": "AMAZON"},
+            {"match_type": MatchType.AMOUNT_GT.value, "match_value": "100"},
+        ]
+
+        assert (
+            _group_to_filter(LogicalOperator.AND.value, conditions)
+            == 'and(description.ilike."*AMAZON*",amount.gt.100.0)'
+        )
+        assert (
+            _group_to_filter(LogicalOperator.OR.value, conditions)
+            == 'or(description.ilike."*AMAZON*",amount.gt.100.0)'
+        )
+
+    def test_group_with_single_condition_is_not_wrapped(self):
+        """Un groupe d'une seule condition n'a pas besoin d'opérateur."""
+        conditions = [{"match_type": MatchType.AMOUNT_LT.value, "match_value": "5"}]
+
+        assert (
+            _group_to_filter(LogicalOperator.AND.value, conditions) == "amount.lt.5.0"
+        )
+
+
+# =============================================================================
+# Tests pour _dedupe_conditions
+# =============================================================================
+
+
+class TestDedupeConditions:
+    """Tests pour la déduplication des conditions."""
+
+    def test_removes_duplicates_and_keeps_order(self):
+        """Les doublons sont supprimés, l'ordre de première occurrence conservé."""
+        conditions = [
+            {"match_type": MatchType.CONTAINS.value, "match_value": "PRIME"},
+            {"match_type": MatchType.CONTAINS.value, "match_value": "AMAZON"},
+            {"match_type": MatchType.CONTAINS.value, "match_value": "PRIME"},
+            {"match_type": MatchType.STARTS_WITH.value, "match_value": "PRIME"},
+        ]
+
+        assert _dedupe_conditions(conditions) == [
+            conditions[0],
+            conditions[1],
+            conditions[3],
+        ]
+
+
+# =============================================================================
+# Tests pour _apply_regex_filters
+# =============================================================================
+
+
+class TestInMemoryConditions:
+    """Tests pour l'évaluation des regex en Python."""
+
+    def test_regex_filters_are_anded_case_insensitive(self):
+        """Toutes les regex doivent matcher, sans tenir compte de la casse."""
+        transactions = [
+            {"transactionId": "tx1", "description": "CB 1234 Amazon"},
+            {"transactionId": "tx2", "description": "CB 5678 FNAC"},
+            {"transactionId": "tx3", "description": "VIREMENT AMAZON"},
+            {"transactionId": "tx4", "description": None},
+        ]
+        conditions = [
+            {"match_type": MatchType.REGEX.value, "match_value": r"CB \d{4}"},
+            {"match_type": MatchType.REGEX.value, "match_value": r"amazon$"},
+        ]
+
+        result = _apply_regex_filters(transactions, conditions)
+
+        assert [tx["transactionId"] for tx in result] == ["tx1"]
+
+    def test_regex_is_compiled_once(self):
+        """Le pattern compilé est réutilisé d'une évaluation à l'autre."""
+        transactions = [{"transactionId": "tx1", "description": "LOYER MARS"}]
+        conditions = [
+            {"match_type": MatchType.REGEX.value, "match_value": r"LOYER \w+"}
+        ]
+
+        _apply_regex_filters(transactions, conditions)
+        hits_before = _compile_regex.cache_info().hits
+        result = _apply_regex_filters(transactions, conditions)
+
+        assert _compile_regex.cache_info().hits == hits_before + 1
+        assert result == transactions
+
+    def test_invalid_regex_never_matches(self):
+        """Une regex invalide ne matche aucune transaction."""
+        transactions = [{"transactionId": "tx1", "description": "(unclosed"}]
+        conditions = [{"match_type": MatchType.REGEX.value, "match_value": "(unclosed"}]
+
+        assert _apply_regex_filters(transactions, conditions) == []
+
+
 # =============================================================================
 # Tests pour _filter_single_slave
 # =============================================================================
@@ -312,8 +473,7 @@ class TestFilterSingleSlave:
 class TestMatchAndConditions:
     """Tests pour la logique AND de matching."""
 
-    @pytest.mark.asyncio
-    async def test_and_with_single_condition_matches(self, mock_db_with_transactions):
+    def test_and_with_single_condition_matches(self, mock_db_with_transactions):
         """AND avec une seule condition doit matcher."""
         tx = {
             "transactionId": "tx1",
@@ -325,15 +485,12 @@ class TestMatchAndConditions:
         rule = {}
         conditions = [{"match_type": MatchType.CONTAINS.value, "match_value": "AMAZON"}]
 
-        result = await _match_and_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_and_conditions(mock_db, rule, conditions, page_size=100)
 
         assert len(result) == 1
         assert result[0]["transactionId"] == "tx1"
 
-    @pytest.mark.asyncio
-    async def test_and_with_multiple_description_conditions(
-        self, mock_db_with_transactions
-    ):
+    def test_and_with_multiple_description_conditions(self, mock_db_with_transactions):
         """AND avec plusieurs conditions de description."""
         tx = {
             "transactionId": "tx1",
@@ -348,13 +505,12 @@ class TestMatchAndConditions:
             {"match_type": MatchType.CONTAINS.value, "match_value": "PRIME"},
         ]
 
-        result = await _match_and_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_and_conditions(mock_db, rule, conditions, page_size=100)
 
         # Les deux conditions sont chaînées dans la query
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_and_with_description_and_amount(self, mock_db_with_transactions):
+    def test_and_with_description_and_amount(self, mock_db_with_transactions):
         """AND avec condition description + montant."""
         tx = {
             "transactionId": "tx1",
@@ -369,12 +525,11 @@ class TestMatchAndConditions:
             {"match_type": MatchType.AMOUNT_GT.value, "match_value": "100"},
         ]
 
-        result = await _match_and_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_and_conditions(mock_db, rule, conditions, page_size=100)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_and_with_amount_range(self, mock_db_with_transactions):
+    def test_and_with_amount_range(self, mock_db_with_transactions):
         """AND avec deux conditions de montant (range)."""
         tx = {
             "transactionId": "tx1",
@@ -389,25 +544,73 @@ class TestMatchAndConditions:
             {"match_type": MatchType.AMOUNT_LTE.value, "match_value": "100"},
         ]
 
-        result = await _match_and_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_and_conditions(mock_db, rule, conditions, page_size=100)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_and_with_empty_conditions_returns_empty(
+    def test_and_with_only_regex_filters_rpc_results_in_python(
         self, mock_db_with_transactions
     ):
+        """AND avec uniquement des regex: un seul appel RPC, le reste en Python."""
+        tx1 = {
+            "transactionId": "tx1",
+            "description": "PAIEMENT CB 1234 AMAZON",
+            "amount": 42.5,
+            "TransactionsSlaves": [{"slaveId": "s1"}],
+        }
+        tx2 = {
+            "transactionId": "tx2",
+            "description": "PAIEMENT CB 5678 FNAC",
+            "amount": 99.0,
+            "TransactionsSlaves": [{"slaveId": "s2"}],
+        }
+        mock_db = mock_db_with_transactions([tx1, tx2])
+        mock_db.rpc.return_value.execute.return_value = SimpleNamespace(
+            data=[{"transactionId": "tx1"}, {"transactionId": "tx2"}]
+        )
+        rule = {}
+        conditions = [
+            {"match_type": MatchType.REGEX.value, "match_value": r"CB \d{4}"},
+            {"match_type": MatchType.REGEX.value, "match_value": r"amazon$"},
+        ]
+
+        result = _match_and_conditions(mock_db, rule, conditions, page_size=100)
+
+        mock_db.rpc.assert_called_once()
+        assert [tx["transactionId"] for tx in result] == ["tx1"]
+
+    def test_and_fetches_all_pages(self, mock_db_with_transactions):
+        """Les résultats sont récupérés page par page jusqu'à la dernière."""
+        transactions = [
+            {
+                "transactionId": f"tx{i}",
+                "description": "AMAZON",
+                "amount": 10.0,
+                "TransactionsSlaves": [{"slaveId": f"s{i}"}],
+            }
+            for i in range(5)
+        ]
+        mock_db = mock_db_with_transactions(transactions)
+        mock_select = mock_db.table.return_value.select.return_value
+        rule = {}
+        conditions = [{"match_type": MatchType.CONTAINS.value, "match_value": "AMAZON"}]
+
+        result = _match_and_conditions(mock_db, rule, conditions, page_size=2)
+
+        assert [tx["transactionId"] for tx in result] == [f"tx{i}" for i in range(5)]
+        assert mock_select.range.call_count == 3
+
+    def test_and_with_empty_conditions_returns_empty(self, mock_db_with_transactions):
         """AND avec conditions vides retourne une liste vide."""
         mock_db = mock_db_with_transactions([])
         rule = {}
         conditions = []
 
-        result = await _match_and_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_and_conditions(mock_db, rule, conditions, page_size=100)
 
         assert result == []
 
-    @pytest.mark.asyncio
-    async def test_and_no_matches_returns_empty(self, mock_db_with_transactions):
+    def test_and_no_matches_returns_empty(self, mock_db_with_transactions):
         """AND sans correspondance retourne une liste vide."""
         mock_db = mock_db_with_transactions([])  # Pas de transactions
         rule = {}
@@ -415,7 +618,7 @@ class TestMatchAndConditions:
             {"match_type": MatchType.CONTAINS.value, "match_value": "NONEXISTENT"}
         ]
 
-        result = await _match_and_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_and_conditions(mock_db, rule, conditions, page_size=100)
 
         assert result == []
 
@@ -428,8 +631,7 @@ class TestMatchAndConditions:
 class TestMatchOrConditions:
     """Tests pour la logique OR de matching."""
 
-    @pytest.mark.asyncio
-    async def test_or_with_single_condition(self, mock_db_with_transactions):
+    def test_or_with_single_condition(self, mock_db_with_transactions):
         """OR avec une seule condition."""
         tx = {
             "transactionId": "tx1",
@@ -443,12 +645,11 @@ class TestMatchOrConditions:
             {"match_type": MatchType.CONTAINS.value, "match_value": "CARREFOUR"}
         ]
 
-        result = await _match_or_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_or_conditions(mock_db, rule, conditions, page_size=100)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_or_matches_first_condition_only(self, mock_db_with_transactions):
+    def test_or_matches_first_condition_only(self, mock_db_with_transactions):
         """OR matche si première condition seulement est vraie."""
         tx = {
             "transactionId": "tx1",
@@ -463,13 +664,12 @@ class TestMatchOrConditions:
             {"match_type": MatchType.CONTAINS.value, "match_value": "LECLERC"},
         ]
 
-        result = await _match_or_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_or_conditions(mock_db, rule, conditions, page_size=100)
 
         assert len(result) == 1
         assert result[0]["transactionId"] == "tx1"
 
-    @pytest.mark.asyncio
-    async def test_or_matches_second_condition_only(self, mock_db_with_transactions):
+    def test_or_matches_second_condition_only(self, mock_db_with_transactions):
         """OR matche si seconde condition seulement est vraie."""
         tx = {
             "transactionId": "tx1",
@@ -484,14 +684,11 @@ class TestMatchOrConditions:
             {"match_type": MatchType.CONTAINS.value, "match_value": "LECLERC"},
         ]
 
-        result = await _match_or_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_or_conditions(mock_db, rule, conditions, page_size=100)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_or_with_description_and_amount_conditions(
-        self, mock_db_with_transactions
-    ):
+    def test_or_with_description_and_amount_conditions(self, mock_db_with_transactions):
         """OR avec conditions mixtes description et montant."""
         tx1 = {
             "transactionId": "tx1",
@@ -512,13 +709,12 @@ class TestMatchOrConditions:
             {"match_type": MatchType.AMOUNT_GT.value, "match_value": "150"},
         ]
 
-        result = await _match_or_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_or_conditions(mock_db, rule, conditions, page_size=100)
 
         # Les deux transactions matchent (une par condition)
         assert len(result) == 2
 
-    @pytest.mark.asyncio
-    async def test_or_deduplicates_results(self, mock_db_with_transactions):
+    def test_or_deduplicates_results(self, mock_db_with_transactions):
         """OR déduplique les résultats si une transaction matche plusieurs conditions."""
         # Transaction qui matche les deux conditions
         tx = {
@@ -534,19 +730,68 @@ class TestMatchOrConditions:
             {"match_type": MatchType.CONTAINS.value, "match_value": "PRIME"},
         ]
 
-        result = await _match_or_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_or_conditions(mock_db, rule, conditions, page_size=100)
 
         # Transaction apparaît une seule fois
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_or_with_empty_conditions(self, mock_db_with_transactions):
+    def test_or_with_regex_uses_rpc_and_unions(self, mock_db_with_transactions):
+        """OR avec une regex: littéraux en une requête, regex via RPC, union."""
+        carrefour = {
+            "transactionId": "tx0",
+            "description": "CARREFOUR CITY",
+            "amount": 10.0,
+            "TransactionsSlaves": [{"slaveId": "s0"}],
+        }
+        prlv = {
+            "transactionId": "tx2",
+            "description": "PRLV SEPA 123456",
+            "amount": 10.0,
+            "TransactionsSlaves": [{"slaveId": "s2"}],
+        }
+        mock_db = mock_db_with_transactions([carrefour])
+        mock_select = mock_db.table.return_value.select.return_value
+        # Relecture des transactions trouvées par la RPC
+        mock_select.execute.return_value = SimpleNamespace(data=[carrefour, prlv])
+        mock_db.rpc.return_value.execute.return_value = SimpleNamespace(
+            data=[{"transactionId": "tx0"}, {"transactionId": "tx2"}]
+        )
+        rule = {}
+        conditions = [
+            {"match_type": MatchType.CONTAINS.value, "match_value": "carrefour"},
+            {"match_type": MatchType.REGEX.value, "match_value": "SEPA [[:digit:]]+"},
+        ]
+
+        result = _match_or_conditions(mock_db, rule, conditions, page_size=100)
+
+        mock_db.rpc.assert_called_once_with(
+            "match_transactions_regex", {"regex_pattern": "SEPA [[:digit:]]+"}
+        )
+        mock_select.or_.assert_called_once_with('description.ilike."*carrefour*"')
+        # Pas de refiltrage Python : le résultat de la RPC est conservé
+        assert [tx["transactionId"] for tx in result] == ["tx0", "tx2"]
+
+    def test_or_sends_duplicate_conditions_once(self, mock_db_with_transactions):
+        """Les conditions identiques ne sont envoyées qu'une seule fois."""
+        mock_db = mock_db_with_transactions([])
+        mock_select = mock_db.table.return_value.select.return_value
+        rule = {}
+        conditions = [
+            {"match_type": MatchType.CONTAINS.value, "match_value": "AMAZON"},
+            {"match_type": MatchType.CONTAINS.value, "match_value": "AMAZON"},
+        ]
+
+        _match_or_conditions(mock_db, rule, conditions, page_size=100)
+
+        mock_select.or_.assert_called_once_with('description.ilike."*AMAZON*"')
+
+    def test_or_with_empty_conditions(self, mock_db_with_transactions):
         """OR avec conditions vides retourne liste vide."""
         mock_db = mock_db_with_transactions([])
         rule = {}
         conditions = []
 
-        result = await _match_or_conditions(mock_db, rule, conditions, page_size=100)
+        result = _match_or_conditions(mock_db, rule, conditions, page_size=100)
 
         assert result == []
 
@@ -559,8 +804,7 @@ class TestMatchOrConditions:
 class TestFindMatchingTransactions:
     """Tests pour la fonction principale de recherche."""
 
-    @pytest.mark.asyncio
-    async def test_single_group_with_and_operator(self, mock_db_with_transactions):
+    def test_single_group_with_and_operator(self, mock_db_with_transactions):
         """Un seul groupe avec opérateur AND."""
         tx = {
             "transactionId": "tx1",
@@ -588,12 +832,11 @@ class TestFindMatchingTransactions:
             ],
         }
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_single_group_with_or_operator(self, mock_db_with_transactions):
+    def test_single_group_with_or_operator(self, mock_db_with_transactions):
         """Un seul groupe avec opérateur OR."""
         tx = {
             "transactionId": "tx1",
@@ -625,12 +868,11 @@ class TestFindMatchingTransactions:
             ],
         }
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_multiple_groups_are_ored(self, mock_db_with_transactions):
+    def test_multiple_groups_are_ored(self, mock_db_with_transactions):
         """Plusieurs groupes sont combinés avec OR."""
         tx1 = {
             "transactionId": "tx1",
@@ -669,13 +911,12 @@ class TestFindMatchingTransactions:
             ],
         }
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         # Les deux groupes sont OR'd, donc les deux transactions matchent
         assert len(result) == 2
 
-    @pytest.mark.asyncio
-    async def test_group_with_description_and_amount(self, mock_db_with_transactions):
+    def test_group_with_description_and_amount(self, mock_db_with_transactions):
         """Groupe combinant description et montant."""
         tx = {
             "transactionId": "tx1",
@@ -707,36 +948,29 @@ class TestFindMatchingTransactions:
             ],
         }
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_empty_condition_groups_returns_empty(
-        self, mock_db_with_transactions
-    ):
+    def test_empty_condition_groups_returns_empty(self, mock_db_with_transactions):
         """Règle sans condition_groups retourne liste vide."""
         mock_db = mock_db_with_transactions([])
         rule = {"description": "No conditions", "condition_groups": []}
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         assert result == []
 
-    @pytest.mark.asyncio
-    async def test_missing_condition_groups_returns_empty(
-        self, mock_db_with_transactions
-    ):
+    def test_missing_condition_groups_returns_empty(self, mock_db_with_transactions):
         """Règle sans clé condition_groups retourne liste vide."""
         mock_db = mock_db_with_transactions([])
         rule = {"description": "Missing key"}
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         assert result == []
 
-    @pytest.mark.asyncio
-    async def test_group_with_empty_conditions_skipped(self, mock_db_with_transactions):
+    def test_group_with_empty_conditions_skipped(self, mock_db_with_transactions):
         """Groupe avec conditions vides est ignoré."""
         tx = {
             "transactionId": "tx1",
@@ -761,12 +995,26 @@ class TestFindMatchingTransactions:
             ],
         }
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_default_operator_is_and(self, mock_db_with_transactions):
+    def test_only_empty_groups_skips_query(self, mock_db_with_transactions):
+        """Si tous les groupes sont vides, aucune requête n'est envoyée."""
+        mock_db = mock_db_with_transactions([])
+        rule = {
+            "description": "Test",
+            "condition_groups": [
+                {"operator": LogicalOperator.OR.value, "conditions": []}
+            ],
+        }
+
+        result = find_matching_transactions(mock_db, rule)
+
+        assert result == []
+        mock_db.table.assert_not_called()
+
+    def test_default_operator_is_and(self, mock_db_with_transactions):
         """L'opérateur par défaut est AND."""
         tx = {
             "transactionId": "tx1",
@@ -794,10 +1042,92 @@ class TestFindMatchingTransactions:
             ],
         }
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         assert len(result) == 1
 
+    def test_rule_without_regex_is_one_or_query(self, mock_db_with_transactions):
+        """Sans regex, toute la règle part en un seul .or_() (groupes AND/OR)."""
+        mock_db = mock_db_with_transactions([])
+        mock_select = mock_db.table.return_value.select.return_value
+        rule = {
+            "description": "Gros achats électronique",
+            "condition_groups": [
+                {
+                    "operator": LogicalOperator.AND.value,
+                    "conditions": [
+                        {
+                            "match_type": MatchType.CONTAINS.value,
+                            "match_value": "CARTE",
+                        },
+                        {
+                            "match_type": MatchType.AMOUNT_GT.value,
+                            "match_value": "200",
+                        },
+                    ],
+                },
+                {
+                    "operator": LogicalOperator.OR.value,
+                    "conditions": [
+                        {"match_type": MatchType.CONTAINS.value, "match_value": "FNAC"},
+                        {
+                            "match_type": MatchType.STARTS_WITH.value,
+                            "match_value": "DARTY",
+                        },
+                    ],
+                },
+            ],
+        }
+
+        find_matching_transactions(mock_db, rule)
+
+        mock_select.or_.assert_called_once_with(
+            'and(description.ilike."*CARTE*",amount.gt.200.0),'
+            'or(description.ilike."*FNAC*",description.ilike."DARTY*")'
+        )
+        mock_select.ilike.assert_not_called()
+        mock_select.gt.assert_not_called()
+        mock_db.rpc.assert_not_called()
+
+    def test_pushed_down_values_are_quoted(self, mock_db_with_transactions):
+        """Virgules, parenthèses et guillemets restent dans des valeurs quotées."""
+        mock_db = mock_db_with_transactions([])
+        mock_select = mock_db.table.return_value.select.return_value
+        rule = {
+            "description": "Loyer",
+            "condition_groups": [
+                {
+                    "operator": LogicalOperator.AND.value,
+                    "conditions": [
+                        {
+                            "match_type": MatchType.EXACT.value,
+                            "match_value": "LOYER (PARIS), APT 3",
+                        },
+                        {
+                            "match_type": MatchType.AMOUNT_LT.value,
+                            "match_value": "1000",
+                        },
+                    ],
+                },
+                {
+                    "operator": LogicalOperator.AND.value,
+                    "conditions": [
+                        {
+                            "match_type": MatchType.STARTS_WITH.value,
+                            "match_value": 'VIR "AGENCE"',
+                        },
+                    ],
+                },
+            ],
+        }
+
+        find_matching_transactions(mock_db, rule)
+
+        mock_select.or_.assert_called_once_with(
+            'and(description.ilike."LOYER (PARIS), APT 3",amount.lt.1000.0),'
+            'description.ilike."VIR \\"AGENCE\\"*"'
+        )
+
 
 # =============================================================================
 # Tests pour les cas complexes
@@ -807,8 +1137,7 @@ class TestFindMatchingTransactions:
 class TestComplexMatchingScenarios:
     """Tests pour des scénarios de matching complexes."""
 
-    @pytest.mark.asyncio
-    async def test_regex_with_amount_range(self, mock_db_with_transactions):
+    def test_regex_with_amount_range(self, mock_db_with_transactions):
         """Regex combiné avec range de montant."""
         tx = {
             "transactionId": "tx1",
@@ -837,12 +1166,11 @@ class TestComplexMatchingScenarios:
             ],
         }
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_or_group_with_exact_match(self, mock_db_with_transactions):
+    def test_or_group_with_exact_match(self, mock_db_with_transactions):
         """Groupe OR avec match exact."""
         tx = {
             "transactionId": "tx1",
@@ -874,12 +1202,11 @@ class TestComplexMatchingScenarios:
             ],
         }
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_multiple_groups_mixed_operators(self, mock_db_with_transactions):
+    def test_multiple_groups_mixed_operators(self, mock_db_with_transactions):
         """Plusieurs groupes avec opérateurs différents."""
         tx = {
             "transactionId": "tx1",
@@ -923,13 +1250,69 @@ class TestComplexMatchingScenarios:
             ],
         }
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         # Transaction matche les deux groupes
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_exact_amount_match(self, mock_db_with_transactions):
+    def test_posix_regex_in_or_group_still_matches(self, mock_db_with_transactions):
+        """Une regex POSIX (~* côté Postgres) dans un groupe OR passe par la RPC."""
+        fnac = {
+            "transactionId": "tx0",
+            "description": "CARTE 4567 FNAC",
+            "amount": 250.0,
+            "TransactionsSlaves": [{"slaveId": "s0"}],
+        }
+        free = {
+            "transactionId": "tx2",
+            "description": "PRLV FREE 0612",
+            "amount": 19.99,
+            "TransactionsSlaves": [{"slaveId": "s2"}],
+        }
+        mock_db = mock_db_with_transactions([fnac])
+        mock_select = mock_db.table.return_value.select.return_value
+        # Relecture des transactions trouvées par la RPC
+        mock_select.execute.return_value = SimpleNamespace(data=[free])
+        mock_db.rpc.return_value.execute.return_value = SimpleNamespace(
+            data=[{"transactionId": "tx2"}]
+        )
+        rule = {
+            "description": "Achats",
+            "condition_groups": [
+                {
+                    "operator": LogicalOperator.AND.value,
+                    "conditions": [
+                        {
+                            "match_type": MatchType.CONTAINS.value,
+                            "match_value": "CARTE",
+                        },
+                        {"match_type": MatchType.AMOUNT_GT.value, "match_value": "200"},
+                    ],
+                },
+                {
+                    "operator": LogicalOperator.OR.value,
+                    "conditions": [
+                        {
+                            "match_type": MatchType.REGEX.value,
+                            "match_value": "FREE [[:digit:]]+",
+                        },
+                        {
+                            "match_type": MatchType.CONTAINS.value,
+                            "match_value": "DARTY",
+                        },
+                    ],
+                },
+            ],
+        }
+
+        result = find_matching_transactions(mock_db, rule)
+
+        mock_db.rpc.assert_called_once_with(
+            "match_transactions_regex", {"regex_pattern": "FREE [[:digit:]]+"}
+        )
+        assert [tx["transactionId"] for tx in result] == ["tx0", "tx2"]
+
+    def test_exact_amount_match(self, mock_db_with_transactions):
         """Match exact sur le montant."""
         tx = {
             "transactionId": "tx1",
@@ -957,12 +1340,11 @@ class TestComplexMatchingScenarios:
             ],
         }
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         assert len(result) == 1
 
-    @pytest.mark.asyncio
-    async def test_starts_with_and_not_exact(self, mock_db_with_transactions):
+    def test_starts_with_and_not_exact(self, mock_db_with_transactions):
         """STARTS_WITH matche le préfixe (pas tout le texte)."""
         tx = {
             "transactionId": "tx1",
@@ -986,6 +1368,6 @@ class TestComplexMatchingScenarios:
             ],
         }
 
-        result = await find_matching_transactions(mock_db, rule)
+        result = find_matching_transactions(mock_db, rule)
 
         assert len(result) == 1
@@ -1,294 +1,131 @@
 """Tests pour l'endpoint de split de slaves (réversibilité des transferts)."""
 
-from unittest.mock import MagicMock
+from uuid import UUID
 
+import pytest
+from fastapi import HTTPException
 
-def setup_split_mocks(mock_db, merged_tx, mock_supabase_response):
-    """Helper pour configurer les mocks pour le split endpoint."""
-    slave_to_split = merged_tx["TransactionsSlaves"][0]
+from ploutos.api.routers.transactions import split_slave
 
-    # Mock pour Transactions table
-    new_transaction = {
-        "transactionId": "dddddddd-dddd-dddd-dddd-dddddddddddd",
-        "accountId": slave_to_split["accountId"],
-        "amount": slave_to_split["amount"],
-        "type": "debit",  # Inverse de credit
-        "date": slave_to_split["date"],
-        "description": f"Split from transaction {merged_tx['transactionId']}",
-    }
+UNKNOWN_ACCOUNT_ID = "99999999-9999-9999-9999-999999999999"
 
-    mock_table_transactions = MagicMock()
-    mock_table_transactions.select.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([merged_tx])
-    )
-    mock_table_transactions.insert.return_value.execute.return_value = (
-        mock_supabase_response([new_transaction])
-    )
 
-    # Mock pour TransactionsSlaves table
-    new_slave = {
-        "slaveId": "eeeeeeee-eeee-eeee-eeee-eeeeeeeeeeee",
-        "masterId": new_transaction["transactionId"],
-        "accountId": merged_tx["accountId"],
-        "amount": slave_to_split["amount"],
-        "type": "credit",
-    }
-    # Mock UPDATE du slave original (pointé vers Unknown)
-    updated_slave = {
-        "slaveId": slave_to_split["slaveId"],
-        "accountId": "99999999-9999-9999-9999-999999999999",  # Unknown account
-        "amount": slave_to_split["amount"],
-        "type": slave_to_split["type"],
-        "updated_at": slave_to_split["date"],
-    }
+@pytest.fixture
+def mock_db(fake_supabase):
+    """Client Supabase factice (remis à zéro par _reset_fake_supabase)."""
+    return fake_supabase
 
-    mock_table_slaves = MagicMock()
-    mock_table_slaves.insert.return_value.execute.return_value = mock_supabase_response(
-        [new_slave]
-    )
-    mock_table_slaves.update.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([updated_slave])
-    )
 
-    def table_router(table_name):
-        if table_name == "Transactions":
-            return mock_table_transactions
-        elif table_name == "TransactionsSlaves":
-            return mock_table_slaves
-        return MagicMock()
+def setup_split_selects(mock_db, merged_tx):
+    """Réponses des lectures faites avant toute écriture (chemins d'erreur)."""
+    mock_db.respond("Accounts", "select", [{"accountId": UNKNOWN_ACCOUNT_ID}])
+    mock_db.respond("Transactions", "select", [merged_tx])
 
-    mock_db.table.side_effect = table_router
 
-    return mock_table_transactions, mock_table_slaves, new_transaction, new_slave
+def setup_split_mocks(mock_db, merged_tx, split_responses):
+    """Helper pour configurer les réponses du split endpoint complet."""
+    setup_split_selects(mock_db, merged_tx)
+    mock_db.respond("Transactions", "insert", [split_responses["new_transaction"]])
+    mock_db.respond("TransactionsSlaves", "insert", [split_responses["new_slave"]])
+    mock_db.respond("TransactionsSlaves", "update", [split_responses["updated_slave"]])
 
 
-def test_split_creates_new_transaction(
+def test_split_happy_path(
     test_client,
     mock_db,
     sample_merged_transaction,
     sample_accounts,
-    mock_supabase_response,
+    sample_split_responses,
+    split_url,
 ):
-    """Le split crée une nouvelle transaction master sur le compte du slave."""
-    # Arrange
-    merged_tx = sample_merged_transaction
-    slave_to_split = merged_tx["TransactionsSlaves"][0]
-
-    mock_transactions, mock_slaves, new_transaction, new_slave = setup_split_mocks(
-        mock_db, merged_tx, mock_supabase_response
-    )
-
-    # Act
-    response = test_client.post(
-        f"/transactions/{merged_tx['transactionId']}/split-slave/{slave_to_split['slaveId']}"
-    )
-
-    # Assert
-    assert response.status_code == 201
-    result = response.json()
-    assert result["created_transaction"]["accountId"] == slave_to_split["accountId"]
-    mock_transactions.insert.assert_called()
-
+    """Le split d'un slave vers un compte réel produit les trois écritures attendues.
 
-def test_split_new_transaction_on_slave_account(
-    test_client,
-    mock_db,
-    sample_merged_transaction,
-    sample_accounts,
-    mock_supabase_response,
-):
-    """La nouvelle transaction est créée sur le compte du slave (destination)."""
+    - Nouvelle transaction master sur le compte du slave (Banque B)
+    - Type inversé (credit → debit) et montant absolu du slave
+    - Slave inverse pointant vers le compte d'origine (Banque A)
+    - Slave original mis à jour vers Unknown
+    """
     # Arrange
     merged_tx = sample_merged_transaction
     slave_to_split = merged_tx["TransactionsSlaves"][0]
 
-    mock_transactions, mock_slaves, new_transaction, new_slave = setup_split_mocks(
-        mock_db, merged_tx, mock_supabase_response
-    )
-
-    # Act
-    response = test_client.post(
-        f"/transactions/{merged_tx['transactionId']}/split-slave/{slave_to_split['slaveId']}"
-    )
-
-    # Assert
-    assert response.status_code == 201
-    result = response.json()
-    # La nouvelle transaction doit être sur le compte de Banque B (le slave)
-    assert result["created_transaction"]["accountId"] == sample_accounts[1]["accountId"]
-
-
-def test_split_creates_inverse_slave(
-    test_client,
-    mock_db,
-    sample_merged_transaction,
-    sample_accounts,
-    mock_supabase_response,
-):
-    """Le split crée un slave inverse pointant vers le compte d'origine."""
-    # Arrange
-    merged_tx = sample_merged_transaction
-
-    mock_transactions, mock_slaves, new_transaction, new_slave = setup_split_mocks(
-        mock_db, merged_tx, mock_supabase_response
-    )
+    setup_split_mocks(mock_db, merged_tx, sample_split_responses)
 
     # Act
-    response = test_client.post(
-        f"/transactions/{merged_tx['transactionId']}/split-slave/{merged_tx['TransactionsSlaves'][0]['slaveId']}"
-    )
+    response = test_client.post(split_url(slave_to_split["slaveId"]))
 
     # Assert
     assert response.status_code == 201
     result = response.json()
-    # Le slave inverse doit pointer vers Banque A (compte d'origine)
-    assert result["created_slave"]["accountId"] == sample_accounts[0]["accountId"]
-    mock_slaves.insert.assert_called()
-
-
-def test_split_updates_original_slave_to_unknown(
-    test_client,
-    mock_db,
-    sample_merged_transaction,
-    sample_accounts,
-    mock_supabase_response,
-):
-    """Le split modifie le slave original pour pointer vers Unknown."""
-    # Arrange
-    merged_tx = sample_merged_transaction
-    slave_id = merged_tx["TransactionsSlaves"][0]["slaveId"]
-
-    mock_transactions, mock_slaves, new_transaction, new_slave = setup_split_mocks(
-        mock_db, merged_tx, mock_supabase_response
-    )
-
-    # Act
-    response = test_client.post(
-        f"/transactions/{merged_tx['transactionId']}/split-slave/{slave_id}"
-    )
-
-    # Assert
-    assert response.status_code == 201
-    result = response.json()
-    assert result["updated_slave"]["slaveId"] == str(slave_id)
-    mock_slaves.update.assert_called()
-
-
-def test_split_reverses_transaction_type(
-    test_client,
-    mock_db,
-    sample_merged_transaction,
-    sample_accounts,
-    mock_supabase_response,
-):
-    """Le split crée une transaction avec le type inversé (credit → debit)."""
-    # Arrange
-    merged_tx = sample_merged_transaction
-
-    mock_transactions, mock_slaves, new_transaction, new_slave = setup_split_mocks(
-        mock_db, merged_tx, mock_supabase_response
-    )
-
-    # Act
-    response = test_client.post(
-        f"/transactions/{merged_tx['transactionId']}/split-slave/{merged_tx['TransactionsSlaves'][0]['slaveId']}"
-    )
-
-    # Assert
-    assert response.status_code == 201
-    result = response.json()
-    # Master original : credit → Nouvelle transaction : debit
-    assert merged_tx["type"] == "credit"
-    assert result["created_transaction"]["type"] == "debit"
-
-
-def test_split_uses_absolute_amount(
-    test_client,
-    mock_db,
-    sample_merged_transaction,
-    sample_accounts,
-    mock_supabase_response,
-):
-    """Le split utilise la valeur absolue du montant du slave."""
-    # Arrange
-    merged_tx = sample_merged_transaction
-    slave_to_split = merged_tx["TransactionsSlaves"][0]
-
-    mock_transactions, mock_slaves, new_transaction, new_slave = setup_split_mocks(
-        mock_db, merged_tx, mock_supabase_response
-    )
-
-    # Act
-    response = test_client.post(
-        f"/transactions/{merged_tx['transactionId']}/split-slave/{slave_to_split['slaveId']}"
-    )
-
-    # Assert
-    assert response.status_code == 201
-    result = response.json()
-
-    assert result["created_transaction"]["amount"] == slave_to_split["amount"]
-
-
-def test_split_invalid_slave_id(
-    test_client, mock_db, sample_merged_transaction, mock_supabase_response
-):
+    assert result["created_transaction"] == sample_split_responses["new_transaction"]
+
+    # Nouvelle transaction envoyée sur le compte du slave (Banque B),
+    # type inversé du master (credit → debit), montant du slave
+    (tx_insert,) = mock_db.calls_to("Transactions", "insert")
+    assert tx_insert.payload["accountId"] == sample_accounts[1]["accountId"]
+    assert tx_insert.payload["type"] == "debit"
+    assert tx_insert.payload["amount"] == slave_to_split["amount"]
+
+    # Slave inverse envoyé vers Banque A (compte d'origine)
+    (slave_insert,) = mock_db.calls_to("TransactionsSlaves", "insert")
+    assert slave_insert.payload["accountId"] == sample_accounts[0]["accountId"]
+    assert slave_insert.payload["type"] == "credit"
+    assert slave_insert.payload["amount"] == slave_to_split["amount"]
+
+    # Le slave original est redirigé vers Unknown
+    (update,) = mock_db.calls_to("TransactionsSlaves", "update")
+    assert update.payload["accountId"] == UNKNOWN_ACCOUNT_ID
+    assert update.filters == [("eq", "slaveId", str(slave_to_split["slaveId"]))]
+
+    # Lectures : compte Unknown par ses champs, transaction par son ID
+    (accounts_select,) = mock_db.calls_to("Accounts", "select")
+    assert accounts_select.filters == [
+        ("eq", "name", "Unknown"),
+        ("eq", "category", "Unknown"),
+        ("eq", "sub_category", "Unknown"),
+        ("eq", "is_real", False),
+    ]
+    (tx_select,) = mock_db.calls_to("Transactions", "select")
+    assert tx_select.filters == [("eq", "transactionId", merged_tx["transactionId"])]
+
+
+def test_split_invalid_slave_id(mock_db, mutable_merged_transaction):
     """Erreur 404 si le slave n'existe pas."""
     # Arrange
-    merged_tx = sample_merged_transaction.copy()
+    merged_tx = mutable_merged_transaction
     merged_tx["TransactionsSlaves"] = []  # Aucun slave
 
-    mock_table_transactions = MagicMock()
-    mock_table_transactions.select.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([merged_tx])
-    )
-
-    def table_router(table_name):
-        if table_name == "Transactions":
-            return mock_table_transactions
-        return MagicMock()
+    setup_split_selects(mock_db, merged_tx)
 
-    mock_db.table.side_effect = table_router
-
-    # Act
-    response = test_client.post(
-        f"/transactions/{merged_tx['transactionId']}/split-slave/cccccccc-cccc-cccc-cccc-dddddddddddd"
-    )
+    # Act: appel direct du handler (pas de round-trip HTTP)
+    with pytest.raises(HTTPException) as exc_info:
+        split_slave(
+            UUID(merged_tx["transactionId"]),
+            UUID("cccccccc-cccc-cccc-cccc-dddddddddddd"),
+            mock_db,
+        )
 
     # Assert
-    assert response.status_code == 404
-    assert "slave" in response.json()["detail"].lower()
+    assert exc_info.value.status_code == 404
+    assert "slave" in exc_info.value.detail.lower()
 
 
-def test_split_non_real_account_slave(
-    test_client, mock_db, sample_merged_transaction, mock_supabase_response
-):
+def test_split_non_real_account_slave(mock_db, mutable_merged_transaction):
     """Erreur 400 si le slave pointe vers un compte virtuel (non réel)."""
     # Arrange
-    merged_tx = sample_merged_transaction.copy()
-    slave_to_split = merged_tx["TransactionsSlaves"][0].copy()
+    merged_tx = mutable_merged_transaction
+    slave_to_split = merged_tx["TransactionsSlaves"][0]
     # Modifier le slave pour qu'il pointe vers un compte virtuel
     slave_to_split["Accounts"]["is_real"] = False
 
-    merged_tx["TransactionsSlaves"] = [slave_to_split]
-
-    mock_table_transactions = MagicMock()
-    mock_table_transactions.select.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([merged_tx])
-    )
-
-    def table_router(table_name):
-        if table_name == "Transactions":
-            return mock_table_transactions
-        return MagicMock()
+    setup_split_selects(mock_db, merged_tx)
 
-    mock_db.table.side_effect = table_router
-
-    # Act
-    response = test_client.post(
-        f"/transactions/{merged_tx['transactionId']}/split-slave/{slave_to_split['slaveId']}"
-    )
+    # Act: appel direct du handler (pas de round-trip HTTP)
+    with pytest.raises(HTTPException) as exc_info:
+        split_slave(
+            UUID(merged_tx["transactionId"]), UUID(slave_to_split["slaveId"]), mock_db
+        )
 
     # Assert
-    assert response.status_code == 400
-    assert "real" in response.json()["detail"].lower()
+    assert exc_info.value.status_code == 400
+    assert "real" in exc_info.value.detail.lower()
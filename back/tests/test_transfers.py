@@ -1,6 +1,18 @@
 """Tests pour le router /transfers."""
 
-from unittest.mock import MagicMock
+import pytest
+
+from ploutos.api.routers.transfers import get_transfer_candidates
+
+TRANSFERS_URL = "/transfers"
+CANDIDATES_URL = f"{TRANSFERS_URL}/candidates"
+MERGE_URL = f"{TRANSFERS_URL}/merge"
+
+
+@pytest.fixture
+def mock_db(fake_supabase):
+    """Client Supabase factice (remis à zéro par _reset_fake_supabase)."""
+    return fake_supabase
 
 
 # =============================================================================
@@ -8,9 +20,7 @@ from unittest.mock import MagicMock
 # =============================================================================
 
 
-def test_get_candidates_valid_pair(
-    test_client, mock_db, sample_transfer_pair, mock_supabase_response
-):
+async def test_get_candidates_valid_pair(async_client, mock_db, sample_transfer_pair):
     """Détecte une paire valide de transactions formant un transfert."""
     # Arrange: Mock la réponse RPC avec une paire valide
     rpc_data = [
@@ -32,12 +42,10 @@ def test_get_candidates_valid_pair(
         }
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_transfer_candidates", "rpc", rpc_data)
 
     # Act: Appel de l'endpoint
-    response = test_client.get("/transfers/candidates")
+    response = await async_client.get(CANDIDATES_URL)
 
     # Assert: Doit retourner 1 paire de candidats
     assert response.status_code == 200
@@ -55,83 +63,21 @@ def test_get_candidates_valid_pair(
     assert candidates[0]["date"] == "2025-01-15"
 
 
-def test_get_candidates_different_amounts(test_client, mock_db, mock_supabase_response):
-    """Ignore les paires avec des montants différents."""
-    # Arrange: La RPC retourne une liste vide car les montants diffèrent
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response([])
-    mock_db.rpc.return_value = mock_rpc
-
-    # Act
-    response = test_client.get("/transfers/candidates")
-
-    # Assert: Aucun candidat détecté
-    assert response.status_code == 200
-    candidates = response.json()
-    assert len(candidates) == 0
-
-
-def test_get_candidates_different_dates(test_client, mock_db, mock_supabase_response):
-    """Ignore les paires avec des dates différentes."""
-    # Arrange: La RPC retourne une liste vide car les dates diffèrent
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response([])
-    mock_db.rpc.return_value = mock_rpc
-
-    # Act
-    response = test_client.get("/transfers/candidates")
-
-    # Assert: Aucun candidat détecté
-    assert response.status_code == 200
-    candidates = response.json()
-    assert len(candidates) == 0
-
-
-def test_get_candidates_same_type(test_client, mock_db, mock_supabase_response):
-    """Ignore les paires avec le même type (credit/credit ou debit/debit)."""
-    # Arrange: La RPC retourne une liste vide car les types sont identiques
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response([])
-    mock_db.rpc.return_value = mock_rpc
-
-    # Act
-    response = test_client.get("/transfers/candidates")
-
-    # Assert: Aucun candidat détecté
-    assert response.status_code == 200
-    candidates = response.json()
-    assert len(candidates) == 0
-
-
-def test_get_candidates_has_real_slave(test_client, mock_db, mock_supabase_response):
-    """Ignore les transactions qui ont déjà un slave vers un compte réel."""
-    # Arrange: La RPC filtre déjà les transactions avec slaves réels
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response([])
-    mock_db.rpc.return_value = mock_rpc
+def test_get_candidates_rejected_by_rpc(mock_db):
+    """Retourne une liste vide quand la RPC n'a retenu aucune paire.
 
-    # Act
-    response = test_client.get("/transfers/candidates")
-
-    # Assert: Aucun candidat (transaction déjà mergée)
-    assert response.status_code == 200
-    candidates = response.json()
-    assert len(candidates) == 0
-
-
-def test_get_candidates_empty(test_client, mock_db, mock_supabase_response):
-    """Retourne une liste vide quand aucune paire n'est détectée."""
+    Le filtrage (montants ou dates différents, même type, slave déjà réel)
+    est fait par la RPC get_transfer_candidates : côté endpoint, tous ces
+    cas se traduisent par la même réponse vide.
+    """
     # Arrange: La RPC retourne une liste vide
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response([])
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_transfer_candidates", "rpc", [])
 
-    # Act
-    response = test_client.get("/transfers/candidates")
+    # Act: appel direct du handler (pas de round-trip HTTP)
+    candidates = get_transfer_candidates(db=mock_db)
 
-    # Assert
-    assert response.status_code == 200
-    assert response.json() == []
+    # Assert: Aucun candidat détecté
+    assert candidates == []
 
 
 # =============================================================================
@@ -139,255 +85,96 @@ def test_get_candidates_empty(test_client, mock_db, mock_supabase_response):
 # =============================================================================
 
 
-def test_merge_keeps_negative_transaction(
-    test_client, mock_db, sample_transfer_pair, sample_accounts, mock_supabase_response
-):
-    """Le merge garde la transaction négative (credit/sortie)."""
-    # Arrange: Mock les appels DB
-    negative_tx = sample_transfer_pair["negative"]
-    positive_tx = sample_transfer_pair["positive"]
-
-    # Track which select call we're on
-    select_call_count = [0]
-
-    def mock_select_eq(*args):
-        """Mock pour retourner la bonne transaction selon l'ID demandé."""
-        select_call_count[0] += 1
-        if select_call_count[0] == 1:
-            # Premier appel: credit transaction
-            return MagicMock(execute=lambda: mock_supabase_response([negative_tx]))
-        elif select_call_count[0] == 2:
-            # Deuxième appel: debit transaction
-            return MagicMock(execute=lambda: mock_supabase_response([positive_tx]))
-        else:
-            # Troisième appel: récupération de la transaction mise à jour (credit)
-            return MagicMock(execute=lambda: mock_supabase_response([negative_tx]))
-
-    # Mock pour les transactions
-    mock_table_transactions = MagicMock()
-    mock_table_transactions.select.return_value.eq.side_effect = mock_select_eq
-
-    # Mock pour TransactionsSlaves (insert et delete)
-    mock_table_slaves = MagicMock()
-    mock_table_slaves.insert.return_value.execute.return_value = mock_supabase_response(
-        [{"slaveId": "new-slave"}]
-    )
-    mock_table_slaves.delete.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([])
-    )
-
-    def table_router(table_name):
-        if table_name == "Transactions":
-            return mock_table_transactions
-        elif table_name == "TransactionsSlaves":
-            return mock_table_slaves
-        return MagicMock()
-
-    mock_db.table.side_effect = table_router
-
-    # Act: Merge les deux transactions
-    response = test_client.post(
-        "/transfers/merge",
+async def post_merge(async_client, negative_tx, positive_tx):
+    """POST /transfers/merge pour une paire (credit, debit)."""
+    return await async_client.post(
+        MERGE_URL,
         json={
             "credit_transaction_id": negative_tx["transactionId"],
             "debit_transaction_id": positive_tx["transactionId"],
         },
     )
 
-    # Assert: La transaction négative doit être conservée
-    assert response.status_code == 200
-    result = response.json()
-    assert result["transactionId"] == negative_tx["transactionId"]
-    assert result["type"] == "credit"
-
 
-def test_merge_deletes_positive_transaction(
-    test_client, mock_db, sample_transfer_pair, mock_supabase_response
-):
-    """Le merge supprime la transaction positive (debit/entrée)."""
-    # Arrange
+@pytest.fixture
+async def merge_response(async_client, mock_db, sample_transfer_pair):
+    """Merge réussi de la paire exemple, avec un slave Unknown à supprimer."""
     negative_tx = sample_transfer_pair["negative"]
     positive_tx = sample_transfer_pair["positive"]
 
-    # Track which select call we're on
-    select_call_count = [0]
-
-    def mock_select_eq(*args):
-        """Mock pour retourner la bonne transaction selon l'ID demandé."""
-        select_call_count[0] += 1
-        if select_call_count[0] == 1:
-            return MagicMock(execute=lambda: mock_supabase_response([negative_tx]))
-        elif select_call_count[0] == 2:
-            return MagicMock(execute=lambda: mock_supabase_response([positive_tx]))
-        else:
-            return MagicMock(execute=lambda: mock_supabase_response([negative_tx]))
-
-    # Mock pour les transactions
-    mock_table_transactions = MagicMock()
-    mock_table_transactions.select.return_value.eq.side_effect = mock_select_eq
-    mock_table_transactions.delete.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([positive_tx])
-    )
-
-    # Mock pour TransactionsSlaves
-    mock_table_slaves = MagicMock()
-    mock_table_slaves.insert.return_value.execute.return_value = mock_supabase_response(
-        []
-    )
-    mock_table_slaves.delete.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([])
-    )
-
-    def table_router(table_name):
-        if table_name == "Transactions":
-            return mock_table_transactions
-        elif table_name == "TransactionsSlaves":
-            return mock_table_slaves
-        return MagicMock()
-
-    mock_db.table.side_effect = table_router
+    # Appels select successifs : la paire, puis la transaction mise à jour
+    mock_db.respond("Transactions", "select", [negative_tx, positive_tx], [negative_tx])
+    mock_db.respond("Transactions", "delete", [positive_tx])
 
-    # Act
-    response = test_client.post(
-        "/transfers/merge",
-        json={
-            "credit_transaction_id": negative_tx["transactionId"],
-            "debit_transaction_id": positive_tx["transactionId"],
-        },
+    # Mock pour TransactionsSlaves (insert et delete)
+    mock_db.respond("TransactionsSlaves", "insert", [{"slaveId": "new-slave-id"}])
+    mock_db.respond(
+        "TransactionsSlaves",
+        "delete",
+        [{"slaveId": "aaaaaaaa-aaaa-aaaa-aaaa-bbbbbbbbbbbb"}],
     )
 
-    # Assert: Vérifier que delete a été appelé pour la transaction positive
+    response = await post_merge(async_client, negative_tx, positive_tx)
     assert response.status_code == 200
-    # Le mock devrait avoir été appelé pour supprimer la transaction debit
-    mock_table_transactions.delete.assert_called()
-
+    return response
 
-def test_merge_creates_real_slave(
-    test_client, mock_db, sample_transfer_pair, sample_accounts, mock_supabase_response
-):
-    """Le merge crée un slave vers le compte réel de destination."""
-    # Arrange
-    negative_tx = sample_transfer_pair["negative"]
-    positive_tx = sample_transfer_pair["positive"]
-
-    # Track which select call we're on
-    select_call_count = [0]
-
-    def mock_select_eq(*args):
-        select_call_count[0] += 1
-        if select_call_count[0] == 1:
-            return MagicMock(execute=lambda: mock_supabase_response([negative_tx]))
-        elif select_call_count[0] == 2:
-            return MagicMock(execute=lambda: mock_supabase_response([positive_tx]))
-        else:
-            return MagicMock(execute=lambda: mock_supabase_response([negative_tx]))
-
-    mock_table_transactions = MagicMock()
-    mock_table_transactions.select.return_value.eq.side_effect = mock_select_eq
-    mock_table_transactions.delete.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([])
-    )
-
-    mock_table_slaves = MagicMock()
-    mock_table_slaves.insert.return_value.execute.return_value = mock_supabase_response(
-        [{"slaveId": "new-slave-id"}]
-    )
-    mock_table_slaves.delete.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([])
-    )
-
-    def table_router(table_name):
-        if table_name == "Transactions":
-            return mock_table_transactions
-        elif table_name == "TransactionsSlaves":
-            return mock_table_slaves
-        return MagicMock()
 
-    mock_db.table.side_effect = table_router
+def test_merge_keeps_negative_transaction(merge_response, sample_transfer_pair):
+    """Le merge garde la transaction négative (credit/sortie)."""
+    result = merge_response.json()
+    assert result["transactionId"] == sample_transfer_pair["negative"]["transactionId"]
+    assert result["type"] == "credit"
 
-    # Act
-    response = test_client.post(
-        "/transfers/merge",
-        json={
-            "credit_transaction_id": negative_tx["transactionId"],
-            "debit_transaction_id": positive_tx["transactionId"],
-        },
-    )
 
-    # Assert: Vérifier qu'un slave a été inséré
-    assert response.status_code == 200
-    # Le mock devrait avoir été appelé pour insérer un slave vers Banque B
-    mock_table_slaves.insert.assert_called()
-    # Récupérer l'appel d'insertion
-    insert_call_args = mock_table_slaves.insert.call_args[0][0]
-    assert insert_call_args["accountId"] == sample_accounts[1]["accountId"]  # Banque B
-    assert insert_call_args["amount"] == 100.0
+def test_merge_reads_pair_in_one_query(merge_response, mock_db, sample_transfer_pair):
+    """La paire est lue en une requête, puis la transaction mise à jour."""
+    negative_id = sample_transfer_pair["negative"]["transactionId"]
+    positive_id = sample_transfer_pair["positive"]["transactionId"]
+    selects = mock_db.calls_to("Transactions", "select")
+    assert [call.filters for call in selects] == [
+        [("in", "transactionId", [negative_id, positive_id])],
+        [("eq", "transactionId", negative_id)],
+    ]
 
 
-def test_merge_removes_unknown_slaves(
-    test_client, mock_db, sample_transfer_pair, mock_supabase_response
+def test_merge_deletes_positive_transaction(
+    merge_response, mock_db, sample_transfer_pair
 ):
-    """Le merge supprime les slaves Unknown existants."""
-    # Arrange
-    negative_tx = sample_transfer_pair["negative"]
-    positive_tx = sample_transfer_pair["positive"]
-
-    # Track which select call we're on
-    select_call_count = [0]
-
-    def mock_select_eq(*args):
-        select_call_count[0] += 1
-        if select_call_count[0] == 1:
-            return MagicMock(execute=lambda: mock_supabase_response([negative_tx]))
-        elif select_call_count[0] == 2:
-            return MagicMock(execute=lambda: mock_supabase_response([positive_tx]))
-        else:
-            return MagicMock(execute=lambda: mock_supabase_response([negative_tx]))
-
-    mock_table_transactions = MagicMock()
-    mock_table_transactions.select.return_value.eq.side_effect = mock_select_eq
-    mock_table_transactions.delete.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([])
-    )
-
-    mock_table_slaves = MagicMock()
-    mock_table_slaves.insert.return_value.execute.return_value = mock_supabase_response(
-        []
-    )
-    mock_table_slaves.delete.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response(
-            [{"slaveId": "aaaaaaaa-aaaa-aaaa-aaaa-bbbbbbbbbbbb"}]
-        )  # Slave supprimé
-    )
-
-    def table_router(table_name):
-        if table_name == "Transactions":
-            return mock_table_transactions
-        elif table_name == "TransactionsSlaves":
-            return mock_table_slaves
-        return MagicMock()
-
-    mock_db.table.side_effect = table_router
+    """Le merge supprime la transaction positive (debit/entrée)."""
+    deletes = mock_db.calls_to("Transactions", "delete")
+    assert [call.filters for call in deletes] == [
+        [("eq", "transactionId", sample_transfer_pair["positive"]["transactionId"])]
+    ]
 
-    # Act
-    response = test_client.post(
-        "/transfers/merge",
-        json={
-            "credit_transaction_id": negative_tx["transactionId"],
-            "debit_transaction_id": positive_tx["transactionId"],
-        },
-    )
 
-    # Assert: Vérifier que delete a été appelé pour les slaves
-    assert response.status_code == 200
-    mock_table_slaves.delete.assert_called()
+def test_merge_creates_real_slave(
+    merge_response, mock_db, sample_accounts, sample_transfer_pair
+):
+    """Le merge crée un slave vers le compte réel de destination."""
+    inserted = mock_db.calls_to("TransactionsSlaves", "insert")
+    assert len(inserted) == 1
+    # Slave inséré : vers Banque B, pour le montant du transfert
+    payload = inserted[0].payload
+    assert payload["masterId"] == sample_transfer_pair["negative"]["transactionId"]
+    assert payload["accountId"] == sample_accounts[1]["accountId"]  # Banque B
+    assert payload["amount"] == 100.0
+    assert payload["type"] == "debit"
+
+
+def test_merge_removes_unknown_slaves(merge_response, mock_db, sample_transfer_pair):
+    """Le merge supprime le slave Unknown du crédit et les slaves du débit."""
+    deletes = mock_db.calls_to("TransactionsSlaves", "delete")
+    assert [call.filters for call in deletes] == [
+        [("eq", "slaveId", "aaaaaaaa-aaaa-aaaa-aaaa-bbbbbbbbbbbb")],
+        [("eq", "masterId", sample_transfer_pair["positive"]["transactionId"])],
+    ]
 
 
-def test_merge_invalid_ids(test_client, mock_db, mock_supabase_response):
+async def test_merge_invalid_ids(async_client):
     """Erreur 422 si les IDs de transactions ne sont pas des UUIDs valides."""
     # Act: Envoyer des IDs invalides (pas des UUIDs)
-    response = test_client.post(
-        "/transfers/merge",
+    response = await async_client.post(
+        MERGE_URL,
         json={
             "credit_transaction_id": "invalid-id-1",
             "debit_transaction_id": "invalid-id-2",
@@ -398,43 +185,18 @@ def test_merge_invalid_ids(test_client, mock_db, mock_supabase_response):
     assert response.status_code == 422
 
 
-def test_merge_mismatched_amounts(
-    test_client, mock_db, sample_transfer_pair, mock_supabase_response
-):
+async def test_merge_mismatched_amounts(async_client, mock_db, sample_transfer_pair):
     """Erreur 400 si les montants ne correspondent pas."""
     # Arrange: Transactions avec montants différents
-    negative_tx = sample_transfer_pair["negative"].copy()
-    positive_tx = sample_transfer_pair["positive"].copy()
+    negative_tx = sample_transfer_pair["negative"]
+    positive_tx = sample_transfer_pair["positive"]
     positive_tx["amount"] = 150.0  # Montant différent
 
-    # Track which select call we're on
-    select_call_count = [0]
-
-    def mock_select_eq(*args):
-        select_call_count[0] += 1
-        if select_call_count[0] == 1:
-            return MagicMock(execute=lambda: mock_supabase_response([negative_tx]))
-        else:
-            return MagicMock(execute=lambda: mock_supabase_response([positive_tx]))
-
-    mock_table_transactions = MagicMock()
-    mock_table_transactions.select.return_value.eq.side_effect = mock_select_eq
-
-    def table_router(table_name):
-        if table_name == "Transactions":
-            return mock_table_transactions
-        return MagicMock()
-
-    mock_db.table.side_effect = table_router
+    # Les deux transactions sont lues en une seule requête
+    mock_db.respond("Transactions", "select", [negative_tx, positive_tx])
 
     # Act
-    response = test_client.post(
-        "/transfers/merge",
-        json={
-            "credit_transaction_id": negative_tx["transactionId"],
-            "debit_transaction_id": positive_tx["transactionId"],
-        },
-    )
+    response = await post_merge(async_client, negative_tx, positive_tx)
 
     # Assert
     assert response.status_code == 400
@@ -446,59 +208,33 @@ def test_merge_mismatched_amounts(
 # =============================================================================
 
 
-def test_get_transfers_list(
-    test_client, mock_db, sample_merged_transaction, mock_supabase_response
-):
-    """Liste les transferts existants (transactions avec slaves réels)."""
-    # Arrange
-    mock_table = MagicMock()
-    mock_table.select.return_value.execute.return_value = mock_supabase_response(
-        [sample_merged_transaction]
-    )
-    mock_db.table.return_value = mock_table
+async def test_get_transfers_list(async_client, mock_db, mutable_merged_transaction):
+    """Liste les transferts existants avec le compte de destination du slave."""
+    # Arrange: l'endpoint aplatit les slaves en place, d'où la copie
+    mock_db.respond("Transactions", "select", [mutable_merged_transaction])
 
     # Act
-    response = test_client.get("/transfers")
+    response = await async_client.get(TRANSFERS_URL)
 
     # Assert
     assert response.status_code == 200
     transfers = response.json()
     assert len(transfers) == 1
-    assert transfers[0]["transactionId"] == sample_merged_transaction["transactionId"]
+    assert transfers[0]["transactionId"] == mutable_merged_transaction["transactionId"]
     assert len(transfers[0]["TransactionsSlaves"]) > 0
-    assert transfers[0]["TransactionsSlaves"][0]["slaveAccountIsReal"] is True
-
-
-def test_get_transfers_includes_destination_name(
-    test_client, mock_db, sample_merged_transaction, mock_supabase_response
-):
-    """Les transferts incluent le nom du compte de destination."""
-    # Arrange
-    mock_table = MagicMock()
-    mock_table.select.return_value.execute.return_value = mock_supabase_response(
-        [sample_merged_transaction]
-    )
-    mock_db.table.return_value = mock_table
-
-    # Act
-    response = test_client.get("/transfers")
-
-    # Assert
-    assert response.status_code == 200
-    transfers = response.json()
-    assert "slaveAccountName" in transfers[0]["TransactionsSlaves"][0]
-    assert transfers[0]["TransactionsSlaves"][0]["slaveAccountName"] == "Banque B"
+    slave = transfers[0]["TransactionsSlaves"][0]
+    assert slave["slaveAccountIsReal"] is True
+    # Nom du compte de destination
+    assert slave["slaveAccountName"] == "Banque B"
 
 
-def test_get_transfers_empty(test_client, mock_db, mock_supabase_response):
+async def test_get_transfers_empty(async_client, mock_db):
     """Retourne une liste vide si aucun transfert n'existe."""
     # Arrange
-    mock_table = MagicMock()
-    mock_table.select.return_value.execute.return_value = mock_supabase_response([])
-    mock_db.table.return_value = mock_table
+    mock_db.respond("Transactions", "select", [])
 
     # Act
-    response = test_client.get("/transfers")
+    response = await async_client.get(TRANSFERS_URL)
 
     # Assert
     assert response.status_code == 200
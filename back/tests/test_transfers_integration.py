@@ -1,153 +1,82 @@
 """Tests d'intégration pour les transferts."""
 
-from unittest.mock import MagicMock
+from itertools import product
 
+import pytest
 
-def test_multiple_transfer_pairs(
-    test_client,
-    mock_db,
-    sample_transfer_pair,
-    sample_unknown_account,
-    mock_supabase_response,
-):
+from ploutos.api.routers.transfers import get_transfer_candidates
+
+UNKNOWN_ACCOUNT_ID = "99999999-9999-9999-9999-999999999999"
+
+
+@pytest.fixture
+def mock_db(fake_supabase):
+    """Client Supabase factice (remis à zéro par _reset_fake_supabase)."""
+    return fake_supabase
+
+
+def test_multiple_transfer_pairs(mock_db, sample_transfer_pair):
     """Détecte plusieurs paires de transferts en même temps."""
     # Arrange: Créer deux paires de transferts
-    pair1_negative = sample_transfer_pair["negative"].copy()
-    pair1_positive = sample_transfer_pair["positive"].copy()
+    pair1_negative = sample_transfer_pair["negative"]
+    pair1_positive = sample_transfer_pair["positive"]
 
     pair2_negative_id = "ffffffff-ffff-ffff-ffff-ffffffffffff"
     pair2_positive_id = "gggggggg-gggg-gggg-gggg-gggggggggggg"
 
+    # Champs communs à chaque côté de paire (seuls les IDs varient)
+    credit_fields = {
+        "description_1": pair1_negative["description"],
+        "date_1": pair1_negative["date"],
+        "type_1": pair1_negative["type"],
+        "amount_1": pair1_negative["amount"],
+        "accountid_1": pair1_negative["accountId"],
+        "accountname_1": "Banque A",
+    }
+    debit_fields = {
+        "description_2": pair1_positive["description"],
+        "date_2": pair1_positive["date"],
+        "type_2": pair1_positive["type"],
+        "amount_2": pair1_positive["amount"],
+        "accountid_2": pair1_positive["accountId"],
+        "accountname_2": "Banque B",
+    }
+
     # La RPC retourne toutes les permutations possibles : 2 credits x 2 debits = 4 paires
     rpc_data = [
-        # Paire 1: pair1_negative + pair1_positive
         {
-            "transactionid_1": pair1_negative["transactionId"],
-            "description_1": pair1_negative["description"],
-            "date_1": pair1_negative["date"],
-            "type_1": pair1_negative["type"],
-            "amount_1": pair1_negative["amount"],
-            "accountid_1": pair1_negative["accountId"],
-            "accountname_1": "Banque A",
-            "transactionid_2": pair1_positive["transactionId"],
-            "description_2": pair1_positive["description"],
-            "date_2": pair1_positive["date"],
-            "type_2": pair1_positive["type"],
-            "amount_2": pair1_positive["amount"],
-            "accountid_2": pair1_positive["accountId"],
-            "accountname_2": "Banque B",
-        },
-        # Paire 2: pair1_negative + pair2_positive
-        {
-            "transactionid_1": pair1_negative["transactionId"],
-            "description_1": pair1_negative["description"],
-            "date_1": pair1_negative["date"],
-            "type_1": pair1_negative["type"],
-            "amount_1": pair1_negative["amount"],
-            "accountid_1": pair1_negative["accountId"],
-            "accountname_1": "Banque A",
-            "transactionid_2": pair2_positive_id,
-            "description_2": pair1_positive["description"],
-            "date_2": pair1_positive["date"],
-            "type_2": pair1_positive["type"],
-            "amount_2": pair1_positive["amount"],
-            "accountid_2": pair1_positive["accountId"],
-            "accountname_2": "Banque B",
-        },
-        # Paire 3: pair2_negative + pair1_positive
-        {
-            "transactionid_1": pair2_negative_id,
-            "description_1": pair1_negative["description"],
-            "date_1": pair1_negative["date"],
-            "type_1": pair1_negative["type"],
-            "amount_1": pair1_negative["amount"],
-            "accountid_1": pair1_negative["accountId"],
-            "accountname_1": "Banque A",
-            "transactionid_2": pair1_positive["transactionId"],
-            "description_2": pair1_positive["description"],
-            "date_2": pair1_positive["date"],
-            "type_2": pair1_positive["type"],
-            "amount_2": pair1_positive["amount"],
-            "accountid_2": pair1_positive["accountId"],
-            "accountname_2": "Banque B",
-        },
-        # Paire 4: pair2_negative + pair2_positive
-        {
-            "transactionid_1": pair2_negative_id,
-            "description_1": pair1_negative["description"],
-            "date_1": pair1_negative["date"],
-            "type_1": pair1_negative["type"],
-            "amount_1": pair1_negative["amount"],
-            "accountid_1": pair1_negative["accountId"],
-            "accountname_1": "Banque A",
-            "transactionid_2": pair2_positive_id,
-            "description_2": pair1_positive["description"],
-            "date_2": pair1_positive["date"],
-            "type_2": pair1_positive["type"],
-            "amount_2": pair1_positive["amount"],
-            "accountid_2": pair1_positive["accountId"],
-            "accountname_2": "Banque B",
-        },
+            "transactionid_1": credit_id,
+            **credit_fields,
+            "transactionid_2": debit_id,
+            **debit_fields,
+        }
+        for credit_id, debit_id in product(
+            (pair1_negative["transactionId"], pair2_negative_id),
+            (pair1_positive["transactionId"], pair2_positive_id),
+        )
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_transfer_candidates", "rpc", rpc_data)
 
-    # Act
-    response = test_client.get("/transfers/candidates")
+    # Act: appel direct du handler (pas de round-trip HTTP)
+    candidates = get_transfer_candidates(db=mock_db)
 
     # Assert: Devrait trouver 4 paires (2 credits x 2 debits = toutes les permutations possibles)
-    assert response.status_code == 200
-    candidates = response.json()
     assert len(candidates) == 4
 
 
-def test_merge_workflow_simple(
-    test_client, mock_db, sample_transfer_pair, sample_accounts, mock_supabase_response
-):
+async def test_merge_workflow_simple(async_client, mock_db, sample_transfer_pair):
     """Test simplifié du workflow merge."""
     # Arrange
     negative_tx = sample_transfer_pair["negative"]
     positive_tx = sample_transfer_pair["positive"]
 
-    # Track which select call we're on
-    select_call_count = [0]
-
-    def mock_select_eq(*args):
-        select_call_count[0] += 1
-        if select_call_count[0] == 1:
-            return MagicMock(execute=lambda: mock_supabase_response([negative_tx]))
-        elif select_call_count[0] == 2:
-            return MagicMock(execute=lambda: mock_supabase_response([positive_tx]))
-        else:
-            return MagicMock(execute=lambda: mock_supabase_response([negative_tx]))
-
-    mock_table_transactions = MagicMock()
-    mock_table_transactions.select.return_value.eq.side_effect = mock_select_eq
-    mock_table_transactions.delete.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([])
-    )
-
-    mock_table_slaves = MagicMock()
-    mock_table_slaves.insert.return_value.execute.return_value = mock_supabase_response(
-        [{"slaveId": "new-slave"}]
-    )
-    mock_table_slaves.delete.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([])
-    )
-
-    def table_router(table_name):
-        if table_name == "Transactions":
-            return mock_table_transactions
-        elif table_name == "TransactionsSlaves":
-            return mock_table_slaves
-        return MagicMock()
-
-    mock_db.table.side_effect = table_router
+    # Lecture groupée de la paire, puis relecture de la transaction mise à jour
+    mock_db.respond("Transactions", "select", [negative_tx, positive_tx], [negative_tx])
+    mock_db.respond("TransactionsSlaves", "insert", [{"slaveId": "new-slave"}])
 
     # Act: Merge
-    response = test_client.post(
+    response = await async_client.post(
         "/transfers/merge",
         json={
             "credit_transaction_id": negative_tx["transactionId"],
@@ -159,79 +88,41 @@ def test_merge_workflow_simple(
     assert response.status_code == 200
     result = response.json()
     assert result["transactionId"] == negative_tx["transactionId"]
+    # Slave envoyé vers le compte de la transaction débit
+    (slave_insert,) = mock_db.calls_to("TransactionsSlaves", "insert")
+    assert slave_insert.payload["masterId"] == negative_tx["transactionId"]
+    assert slave_insert.payload["accountId"] == positive_tx["accountId"]
 
 
-def test_split_workflow_simple(
-    test_client,
-    mock_db,
-    sample_merged_transaction,
-    sample_accounts,
-    mock_supabase_response,
+async def test_split_workflow_simple(
+    async_client, mock_db, sample_merged_transaction, sample_split_responses, split_url
 ):
     """Test simplifié du workflow split."""
     # Arrange
     merged_tx = sample_merged_transaction
     slave_to_split = merged_tx["TransactionsSlaves"][0]
 
-    # Mock pour Transactions table
-    new_transaction = {
-        "transactionId": "dddddddd-dddd-dddd-dddd-dddddddddddd",
-        "accountId": slave_to_split["accountId"],
-        "amount": slave_to_split["amount"],
-        "type": slave_to_split["type"],  # Inverse de credit
-        "date": slave_to_split["date"],
-        "description": f"Split from transaction {merged_tx['transactionId']}",
-    }
-
-    mock_table_transactions = MagicMock()
-    mock_table_transactions.select.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([merged_tx])
+    mock_db.respond("Accounts", "select", [{"accountId": UNKNOWN_ACCOUNT_ID}])
+    mock_db.respond("Transactions", "select", [merged_tx])
+    mock_db.respond(
+        "Transactions", "insert", [sample_split_responses["new_transaction"]]
     )
-    mock_table_transactions.insert.return_value.execute.return_value = (
-        mock_supabase_response([new_transaction])
+    mock_db.respond(
+        "TransactionsSlaves", "insert", [sample_split_responses["new_slave"]]
     )
-
-    # Mock pour TransactionsSlaves table
-    new_slave = {
-        "slaveId": "eeeeeeee-eeee-eeee-eeee-eeeeeeeeeeee",
-        "masterId": new_transaction["transactionId"],
-        "accountId": merged_tx["accountId"],
-        "amount": slave_to_split["amount"],
-        "type": "debit" if slave_to_split["type"] == "credit" else "credit",
-    }
-    # Mock UPDATE du slave original (pointé vers Unknown)
-    updated_slave = {
-        "slaveId": slave_to_split["slaveId"],
-        "accountId": "99999999-9999-9999-9999-999999999999",  # Unknown account
-        "amount": slave_to_split["amount"],
-        "type": slave_to_split["type"],
-        "updated_at": slave_to_split["date"],
-    }
-
-    mock_table_slaves = MagicMock()
-    mock_table_slaves.insert.return_value.execute.return_value = mock_supabase_response(
-        [new_slave]
-    )
-    mock_table_slaves.update.return_value.eq.return_value.execute.return_value = (
-        mock_supabase_response([updated_slave])
+    mock_db.respond(
+        "TransactionsSlaves", "update", [sample_split_responses["updated_slave"]]
     )
 
-    def table_router(table_name):
-        if table_name == "Transactions":
-            return mock_table_transactions
-        elif table_name == "TransactionsSlaves":
-            return mock_table_slaves
-        return MagicMock()
-
-    mock_db.table.side_effect = table_router
-
     # Act: Split
-    response = test_client.post(
-        f"/transactions/{merged_tx['transactionId']}/split-slave/{slave_to_split['slaveId']}"
-    )
+    response = await async_client.post(split_url(slave_to_split["slaveId"]))
 
     # Assert
     assert response.status_code == 201
-    result = response.json()
-    assert result["created_transaction"]["accountId"] == slave_to_split["accountId"]
-    assert result["updated_slave"]["slaveId"] == str(slave_to_split["slaveId"])
+    # Écritures envoyées : nouvelle transaction sur le compte du slave,
+    # slave original redirigé vers Unknown
+    (tx_insert,) = mock_db.calls_to("Transactions", "insert")
+    assert tx_insert.payload["accountId"] == slave_to_split["accountId"]
+    (update,) = mock_db.calls_to("TransactionsSlaves", "update")
+    assert update.payload["accountId"] == UNKNOWN_ACCOUNT_ID
+    assert update.filters == [("eq", "slaveId", str(slave_to_split["slaveId"]))]
@@ -1,19 +1,21 @@
 """Tests pour le rejet de paires de transferts candidates."""
 
-from unittest.mock import MagicMock
+import pytest
 
+REJECTED_TABLE = "RejectedTransferPairs"
 
-def test_reject_transfer_candidate_success(
-    test_client, mock_db, sample_transfer_pair, mock_supabase_response
-):
+
+@pytest.fixture
+def mock_db(fake_supabase):
+    """Client Supabase factice (remis à zéro par _reset_fake_supabase)."""
+    return fake_supabase
+
+
+def test_reject_transfer_candidate_success(test_client, mock_db, sample_transfer_pair):
     """Rejette une paire de candidats avec succès."""
     # Arrange: Mock la vérification d'existence (aucune) et l'insertion
-    mock_table = MagicMock()
-
     # Premier appel: vérifier si déjà rejeté (non)
-    mock_table.select.return_value.eq.return_value.eq.return_value.execute.return_value = mock_supabase_response(
-        []
-    )
+    mock_db.respond(REJECTED_TABLE, "select", [])
 
     # Deuxième appel: insérer le rejet
     rejected_pair = {
@@ -23,11 +25,7 @@ def test_reject_transfer_candidate_success(
         "rejected_at": "2025-01-15T10:00:00",
         "rejected_reason": "Not a real transfer",
     }
-    mock_table.insert.return_value.execute.return_value = mock_supabase_response(
-        [rejected_pair]
-    )
-
-    mock_db.table.return_value = mock_table
+    mock_db.respond(REJECTED_TABLE, "insert", [rejected_pair])
 
     # Act
     response = test_client.post(
@@ -46,12 +44,10 @@ def test_reject_transfer_candidate_success(
     assert result["rejected_reason"] == "Not a real transfer"
 
 
-def test_reject_hides_from_candidates(test_client, mock_db, mock_supabase_response):
+def test_reject_hides_from_candidates(test_client, mock_db):
     """Une paire rejetée n'apparaît plus dans les candidats."""
     # Arrange: La RPC retourne une liste vide (paire filtrée)
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response([])
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_transfer_candidates", "rpc", [])
 
     # Act: Récupérer les candidats après rejet
     response = test_client.get("/transfers/candidates")
@@ -62,21 +58,15 @@ def test_reject_hides_from_candidates(test_client, mock_db, mock_supabase_respon
     assert len(candidates) == 0
 
 
-def test_unreject_transfer_candidate(
-    test_client, mock_db, sample_transfer_pair, mock_supabase_response
-):
+def test_unreject_transfer_candidate(test_client, mock_db, sample_transfer_pair):
     """Annule le rejet d'une paire avec succès."""
     # Arrange: Mock la suppression
-    mock_table = MagicMock()
     deleted_pair = {
         "pair_id": "cccccccc-cccc-cccc-cccc-cccccccccccc",
         "transaction_id_1": sample_transfer_pair["negative"]["transactionId"],
         "transaction_id_2": sample_transfer_pair["positive"]["transactionId"],
     }
-    mock_table.delete.return_value.eq.return_value.eq.return_value.execute.return_value = mock_supabase_response(
-        [deleted_pair]
-    )
-    mock_db.table.return_value = mock_table
+    mock_db.respond(REJECTED_TABLE, "delete", [deleted_pair])
 
     # Act
     response = test_client.delete(
@@ -89,9 +79,7 @@ def test_unreject_transfer_candidate(
     assert response.status_code == 204
 
 
-def test_unreject_shows_in_candidates(
-    test_client, mock_db, sample_transfer_pair, mock_supabase_response
-):
+def test_unreject_shows_in_candidates(test_client, mock_db, sample_transfer_pair):
     """Une paire dont le rejet est annulé réapparaît dans les candidats."""
     # Arrange: La RPC retourne la paire (plus dans rejected)
     rpc_data = [
@@ -113,9 +101,7 @@ def test_unreject_shows_in_candidates(
         }
     ]
 
-    mock_rpc = MagicMock()
-    mock_rpc.execute.return_value = mock_supabase_response(rpc_data)
-    mock_db.rpc.return_value = mock_rpc
+    mock_db.respond("get_transfer_candidates", "rpc", rpc_data)
 
     # Act
     response = test_client.get("/transfers/candidates")
@@ -126,12 +112,9 @@ def test_unreject_shows_in_candidates(
     assert len(candidates) == 1
 
 
-def test_reject_duplicate_returns_conflict(
-    test_client, mock_db, sample_transfer_pair, mock_supabase_response
-):
+def test_reject_duplicate_returns_conflict(test_client, mock_db, sample_transfer_pair):
     """Rejeter une paire déjà rejetée retourne 409 Conflict."""
     # Arrange: Mock la vérification d'existence (existe déjà)
-    mock_table = MagicMock()
     existing_rejection = {
         "pair_id": "cccccccc-cccc-cccc-cccc-cccccccccccc",
         "transaction_id_1": sample_transfer_pair["negative"]["transactionId"],
@@ -139,10 +122,7 @@ def test_reject_duplicate_returns_conflict(
         "rejected_at": "2025-01-15T10:00:00",
         "rejected_reason": "Already rejected",
     }
-    mock_table.select.return_value.eq.return_value.eq.return_value.execute.return_value = mock_supabase_response(
-        [existing_rejection]
-    )
-    mock_db.table.return_value = mock_table
+    mock_db.respond(REJECTED_TABLE, "select", [existing_rejection])
 
     # Act
     response = test_client.post(
@@ -159,14 +139,10 @@ def test_reject_duplicate_returns_conflict(
     assert "already been rejected" in response.json()["detail"]
 
 
-def test_unreject_not_found_returns_404(test_client, mock_db, mock_supabase_response):
+def test_unreject_not_found_returns_404(test_client, mock_db):
     """Annuler un rejet inexistant retourne 404."""
     # Arrange: Mock la suppression (rien trouvé)
-    mock_table = MagicMock()
-    mock_table.delete.return_value.eq.return_value.eq.return_value.execute.return_value = mock_supabase_response(
-        []
-    )
-    mock_db.table.return_value = mock_table
+    mock_db.respond(REJECTED_TABLE, "delete", [])
 
     # Act
     response = test_client.delete(
@@ -180,12 +156,10 @@ def test_unreject_not_found_returns_404(test_client, mock_db, mock_supabase_resp
     assert "not found" in response.json()["detail"]
 
 
-def test_get_rejected_pairs_empty(test_client, mock_db, mock_supabase_response):
+def test_get_rejected_pairs_empty(test_client, mock_db):
     """Liste vide si aucune paire rejetée."""
     # Arrange
-    mock_table = MagicMock()
-    mock_table.select.return_value.execute.return_value = mock_supabase_response([])
-    mock_db.table.return_value = mock_table
+    mock_db.respond(REJECTED_TABLE, "select", [])
 
     # Act
     response = test_client.get("/transfers/candidates/rejected")
@@ -195,9 +169,7 @@ def test_get_rejected_pairs_empty(test_client, mock_db, mock_supabase_response):
     assert response.json() == []
 
 
-def test_get_rejected_pairs_list(
-    test_client, mock_db, sample_transfer_pair, mock_supabase_response
-):
+def test_get_rejected_pairs_list(test_client, mock_db, sample_transfer_pair):
     """Liste toutes les paires rejetées avec leurs détails."""
     # Arrange
     rejected_pairs = [
@@ -217,11 +189,7 @@ def test_get_rejected_pairs_list(
         },
     ]
 
-    mock_table = MagicMock()
-    mock_table.select.return_value.execute.return_value = mock_supabase_response(
-        rejected_pairs
-    )
-    mock_db.table.return_value = mock_table
+    mock_db.respond(REJECTED_TABLE, "select", rejected_pairs)
 
     # Act
     response = test_client.get("/transfers/candidates/rejected")
@@ -232,3 +200,27 @@ def test_get_rejected_pairs_list(
     assert len(result) == 2
     assert result[0]["rejected_reason"] == "Not a transfer"
     assert result[1]["rejected_reason"] == "False positive"
+
+
+def test_candidates_recomputed_after_reject(test_client, mock_db, sample_transfer_pair):
+    """Chaque lecture des candidats appelle la RPC, y compris après un rejet."""
+    # Arrange: aucun candidat, aucun rejet existant
+    mock_db.respond("get_transfer_candidates", "rpc", [])
+    mock_db.respond(REJECTED_TABLE, "insert", [{"pair_id": "p"}])
+
+    # Act: une lecture, un rejet, puis une nouvelle lecture
+    first = test_client.get("/transfers/candidates")
+    resp = test_client.post(
+        "/transfers/candidates/reject",
+        json={
+            "credit_transaction_id": sample_transfer_pair["negative"]["transactionId"],
+            "debit_transaction_id": sample_transfer_pair["positive"]["transactionId"],
+        },
+    )
+    second = test_client.get("/transfers/candidates")
+
+    # Assert
+    assert first.status_code == 200
+    assert resp.status_code == 201
+    assert second.status_code == 200
+    assert len(mock_db.calls_to("get_transfer_candidates", "rpc")) == 2